@@ -7,6 +7,7 @@ import pandas as pd
 import plotly.graph_objects as go
 import numpy as np
 from datetime import datetime
+import logging
 import sys
 import os
 
@@ -381,6 +382,8 @@ def render_additional_analytics(data, filters):
 
 def render_performance_breakdown(data, filters):
     """Render detailed performance breakdown"""
+    from utils.helpers import is_tp_outcome
+    
     st.subheader("Performance Breakdown")
     
     time_range = filters.get('time_range', 'all')
@@ -406,10 +409,11 @@ def render_performance_breakdown(data, filters):
         # Outcome distribution
         # TP Level breakdown
         if 'final_outcome' in filtered_data.columns:
-            tp_data = filtered_data[filtered_data['final_outcome'].str.startswith('tp', na=False)]
+            tp_data = filtered_data[is_tp_outcome(filtered_data['final_outcome'])]
     
             if not tp_data.empty:
                 tp_counts = tp_data['final_outcome'].value_counts().sort_index()
+                tp_counts = tp_counts[tp_counts > 0]
                 total_tp = tp_counts.sum()
         
         # Calculate percentages
@@ -441,23 +445,21 @@ def render_performance_breakdown(data, filters):
     with col2:
     # Top 10 Best Performing Coins (Bar Chart Miring)
         if 'pair' in filtered_data.columns and 'final_outcome' in filtered_data.columns:
-        # Calculate win rate per coin
-            pair_stats = []
-            for pair in filtered_data['pair'].unique():
-                pair_data = filtered_data[filtered_data['pair'] == pair]
-                closed_pair = pair_data[pair_data['final_outcome'].notna()]
-            
-                if len(closed_pair) >= 3:  # Minimum 3 trades
-                    tp_hits = closed_pair['final_outcome'].str.startswith('tp', na=False).sum()
-                    win_rate = (tp_hits / len(closed_pair) * 100)
-                    pair_stats.append({
-                        'pair': pair,
-                        'win_rate': win_rate,
-                        'trades': len(closed_pair)
-                 })
+        # Calculate win rate per coin - closed and TP counts for every pair
+        # in one groupby (first-appearance order, like unique())
+            outcomes = filtered_data['final_outcome']
+            pair_counts = pd.DataFrame({
+                'trades': outcomes.notna().to_numpy(),
+                'tp_hits': is_tp_outcome(outcomes).to_numpy()
+            }).groupby(filtered_data['pair'].to_numpy(), sort=False).sum()
+            pair_counts = pair_counts[pair_counts['trades'] >= 3]  # Minimum 3 trades
         
-            if pair_stats:
-                pair_df = pd.DataFrame(pair_stats)
+            if not pair_counts.empty:
+                pair_df = pd.DataFrame({
+                    'pair': pair_counts.index.to_numpy(),
+                    'win_rate': pair_counts['tp_hits'].to_numpy() / pair_counts['trades'].to_numpy() * 100,
+                    'trades': pair_counts['trades'].to_numpy()
+                })
                 top_10 = pair_df.nlargest(30, 'win_rate')
             
                 fig = go.Figure(data=[go.Bar(
@@ -489,17 +491,6 @@ def render_performance_breakdown(data, filters):
         else:
             st.info("Missing data for coins analysis")
 
-def render_rolling_analytics(data, filters):
-    """Render rolling analytics with time range support"""
-    st.subheader("Rolling Analysis")
-    
-    try:
-        from components.modern_metrics import render_rolling_winrate_chart
-        render_rolling_winrate_chart(data, filters)
-    except ImportError:
-        st.warning("Rolling analysis component not available")
-        st.info("This feature requires the modern_metrics component")
-
 def render_rr_analytics(data, filters):
     """Render risk-reward analytics"""
     st.subheader("Risk-Reward Analysis")
@@ -650,6 +641,8 @@ def render_basic_sidebar():
 
 def render_basic_winrate_chart(data):
     """Basic winrate chart fallback"""
+    from utils.helpers import is_tp_outcome
+    
     st.subheader("📈 Win Rate Trend Analysis")
     
     if 'created_at' not in data.columns or 'final_outcome' not in data.columns:
@@ -670,7 +663,7 @@ def render_basic_winrate_chart(data):
         st.info("No valid date data")
         return
     
-    closed_data['is_winner'] = closed_data['final_outcome'].str.startswith('tp', na=False)
+    closed_data['is_winner'] = is_tp_outcome(closed_data['final_outcome'])
     
     # Group by date
     daily_stats = closed_data.groupby('date').agg({
@@ -719,6 +712,8 @@ def render_basic_winrate_chart(data):
     
 def render_rolling_analytics(data, filters):
     """Render rolling analytics with basic implementation"""
+    from utils.helpers import is_tp_outcome
+    
     st.subheader("Rolling Analysis")
     
     if 'created_at' not in data.columns or 'final_outcome' not in data.columns:
@@ -734,7 +729,7 @@ def render_rolling_analytics(data, filters):
     # Sort by date
     closed_data['created_at'] = pd.to_datetime(closed_data['created_at'], errors='coerce')
     closed_data = closed_data.sort_values('created_at')
-    closed_data['is_winner'] = closed_data['final_outcome'].str.startswith('tp', na=False)
+    closed_data['is_winner'] = is_tp_outcome(closed_data['final_outcome'])
     
     # Calculate 30-day rolling win rate
     window = 30
@@ -766,6 +761,8 @@ def render_rolling_analytics(data, filters):
 
 def calculate_basic_metrics(data):
     """Calculate basic summary metrics as fallback"""
+    from utils.helpers import is_tp_outcome
+    
     if data is None or data.empty:
         return {
             'total_signals': 0, 'closed_trades': 0, 'open_signals': 0,
@@ -783,7 +780,7 @@ def calculate_basic_metrics(data):
     
     # Win rate
     if metrics['closed_trades'] > 0 and 'final_outcome' in data.columns:
-        tp_hits = data['final_outcome'].str.startswith('tp', na=False).sum()
+        tp_hits = is_tp_outcome(data['final_outcome']).sum()
         metrics['tp_hits'] = tp_hits
         metrics['sl_hits'] = (data['final_outcome'] == 'sl').sum()
         metrics['win_rate'] = (tp_hits / metrics['closed_trades'] * 100)
@@ -842,6 +839,7 @@ def render_outcome_analysis(data, filters):
             
             if not closed_data.empty:
                 outcome_counts = closed_data['final_outcome'].value_counts()
+                outcome_counts = outcome_counts[outcome_counts > 0]
                 
                 fig = go.Figure(data=[go.Pie(
                     labels=outcome_counts.index,
@@ -926,4 +924,5 @@ def render_outcome_analysis(data, filters):
             st.info("Missing entry/target columns for analysis")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     main()
\ No newline at end of file
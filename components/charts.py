@@ -332,7 +332,7 @@ def render_outcome_timeline(data):
     timeline_data = closed_data.groupby([
         closed_data['created_at'].dt.date,
         'final_outcome'
-    ]).size().unstack(fill_value=0)
+    ], observed=True).size().unstack(fill_value=0)
     
     if timeline_data.empty:
         return
@@ -148,6 +148,10 @@ def prepare_export_data(data):
     for col in datetime_cols:
         export_df[col] = export_df[col].dt.strftime('%Y-%m-%d %H:%M:%S')
     
+    # Categoricals only accept known categories, so export them as plain values
+    category_cols = export_df.select_dtypes(include=['category']).columns
+    export_df[category_cols] = export_df[category_cols].astype(object)
+    
     # Replace NaN values with empty strings for cleaner export
     export_df = export_df.fillna('')
     
@@ -160,26 +164,41 @@ def render_column_info(data):
     
     st.markdown("### Column Information")
     
+    # Per-column stats computed once over the whole frame; dtypes is metadata only
+    n = len(data)
+    dtypes = data.dtypes
+    null_counts = data.isna().sum()
+    
+    categorical_cols = [
+        col for col, dtype in dtypes.items()
+        if dtype == 'object' or dtype.name == 'category'
+    ]
+    numeric_cols = [
+        col for col, dtype in dtypes.items()
+        if col not in categorical_cols and pd.api.types.is_numeric_dtype(dtype)
+    ]
+    unique_counts = data[categorical_cols].nunique() if categorical_cols else pd.Series(dtype='int64')
+    mins = data[numeric_cols].min() if numeric_cols else pd.Series(dtype=float)
+    maxs = data[numeric_cols].max() if numeric_cols else pd.Series(dtype=float)
+    
     # Create column info dataframe
     column_info = []
     
     for col in data.columns:
         info = {
             'Column': col,
-            'Type': str(data[col].dtype),
-            'Non-Null': f"{data[col].count():,}",
-            'Null %': f"{(data[col].isna().sum() / len(data) * 100):.1f}%"
+            'Type': str(dtypes[col]),
+            'Non-Null': f"{n - null_counts[col]:,}",
+            'Null %': f"{(null_counts[col] / n * 100):.1f}%"
         }
         
         # Add unique values for categorical columns
-        if data[col].dtype == 'object' or data[col].dtype.name == 'category':
-            unique_count = data[col].nunique()
-            info['Unique'] = f"{unique_count:,}"
-        else:
+        if col in unique_counts.index:
+            info['Unique'] = f"{unique_counts[col]:,}"
+        elif col in mins.index:
             # Add basic stats for numeric columns
-            if pd.api.types.is_numeric_dtype(data[col]):
-                info['Min'] = f"{data[col].min():.2f}" if pd.notna(data[col].min()) else "N/A"
-                info['Max'] = f"{data[col].max():.2f}" if pd.notna(data[col].max()) else "N/A"
+            info['Min'] = f"{mins[col]:.2f}" if pd.notna(mins[col]) else "N/A"
+            info['Max'] = f"{maxs[col]:.2f}" if pd.notna(maxs[col]) else "N/A"
         
         column_info.append(info)
     
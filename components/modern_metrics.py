@@ -7,6 +7,8 @@ import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 
+from utils.helpers import is_tp_outcome
+
 # LuxQuant Blue-Gold Theme Colors
 COLORS = {
     "background": "#0B1426",           # Deep blue background
@@ -294,7 +296,7 @@ def render_basic_winrate_fallback(data, time_range='all'):
         
         # Calculate daily stats
         closed_data['date'] = closed_data['created_at'].dt.date
-        closed_data['is_winner'] = closed_data['final_outcome'].str.startswith('tp', na=False)
+        closed_data['is_winner'] = is_tp_outcome(closed_data['final_outcome'])
         
         daily_stats = closed_data.groupby('date').agg({
             'is_winner': ['sum', 'count']
@@ -610,7 +612,7 @@ def calculate_summary_metrics(data, time_range='all'):
         
         # Win/Loss metrics
         if 'final_outcome' in filtered_data.columns and metrics['closed_trades'] > 0:
-            metrics['tp_hits'] = filtered_data['final_outcome'].str.startswith('tp', na=False).sum()
+            metrics['tp_hits'] = is_tp_outcome(filtered_data['final_outcome']).sum()
             metrics['sl_hits'] = (filtered_data['final_outcome'] == 'sl').sum()
             metrics['win_rate'] = (metrics['tp_hits'] / metrics['closed_trades'] * 100) if metrics['closed_trades'] > 0 else 0
             metrics['tp_rate'] = (metrics['tp_hits'] / metrics['closed_trades'] * 100) if metrics['closed_trades'] > 0 else 0
@@ -742,7 +744,7 @@ def render_rolling_winrate_chart(data, filters=None):
     # Sort by date and calculate rolling metrics
     closed_data['created_at'] = pd.to_datetime(closed_data['created_at'], errors='coerce')
     closed_data = closed_data.sort_values('created_at').reset_index(drop=True)
-    closed_data['is_winner'] = closed_data['final_outcome'].str.startswith('tp', na=False)
+    closed_data['is_winner'] = is_tp_outcome(closed_data['final_outcome'])
     
     # Calculate different rolling windows
     windows = [10, 30, 50]
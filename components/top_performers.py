@@ -6,9 +6,11 @@ import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 
+from utils.helpers import add_outcome_flags
+
 # Safe theme import with fallbacks
 try:
-    from config.theme import COLORS, PLOTLY_CONFIG
+    from config.theme import COLORS, BASE_LAYOUT
 except ImportError:
     COLORS = {
         "green": "#00D46A",
@@ -18,7 +20,14 @@ except ImportError:
         "purple": "#9D5CFF",
         "text_muted": "#6B6B6B"
     }
-    PLOTLY_CONFIG = {}
+    BASE_LAYOUT = go.Layout(
+        template="plotly_dark",
+        paper_bgcolor="#1A1D24",
+        plot_bgcolor="#1A1D24",
+        font={"color": "#FFFFFF"},
+        xaxis={"gridcolor": "#2D3139"},
+        yaxis={"gridcolor": "#2D3139"}
+    )
 
 def render_top_performers(data):
     """Render top performers section with enhanced error handling"""
@@ -65,57 +74,44 @@ def calculate_pair_metrics_safe(data):
         if data is None or data.empty or 'pair' not in data.columns:
             return pd.DataFrame()
         
-        st.info(f"📊 Calculating metrics for {data['pair'].nunique()} unique pairs...")
+        # Outcome flags are computed once here and summed per pair below
+        data = add_outcome_flags(data)
         
-        metrics_list = []
+        # One groupby shared by every per-pair aggregate below
+        pair_groups = data.groupby('pair', sort=False, observed=True)
         
-        for pair in data['pair'].unique():
-            if pd.isna(pair) or pair == 'UNKNOWN':
-                continue
-                
-            pair_data = data[data['pair'] == pair]
-            
-            if pair_data.empty:
-                continue
-            
-            metrics = {
-                'pair': pair,
-                'total_signals': len(pair_data),
-                'closed_trades': 0,
-                'win_rate': 0,
-                'tp_hits': 0,
-                'sl_hits': 0,
-                'avg_rr': 0,
-                'score': 0
-            }
-            
-            # Calculate closed trades
-            if 'final_outcome' in pair_data.columns:
-                closed_data = pair_data[
-                    pair_data['final_outcome'].notna() & 
-                    (pair_data['final_outcome'] != 'open') &
-                    (pair_data['final_outcome'] != '')
-                ]
-                metrics['closed_trades'] = len(closed_data)
-                
-                # Win rate calculation
-                if metrics['closed_trades'] > 0:
-                    tp_hits = closed_data['final_outcome'].str.startswith('tp', na=False).sum()
-                    metrics['tp_hits'] = tp_hits
-                    metrics['sl_hits'] = (closed_data['final_outcome'] == 'sl').sum()
-                    metrics['win_rate'] = (tp_hits / metrics['closed_trades'] * 100)
-            
-            # RR metrics
-            if 'rr_planned' in pair_data.columns:
-                rr_data = pair_data['rr_planned'].dropna()
-                metrics['avg_rr'] = rr_data.mean() if len(rr_data) > 0 else 0
-            
-            # Score calculation (for overall ranking)
-            metrics['score'] = calculate_pair_score_safe(metrics)
-            
-            metrics_list.append(metrics)
+        st.info(f"📊 Calculating metrics for {pair_groups.ngroups} unique pairs...")
+        
+        result_df = pair_groups.size().rename('total_signals').to_frame()
+        
+        # Closed trades and hits from the shared outcome flags
+        if '_is_closed' in data.columns:
+            flag_sums = pair_groups[['_is_closed', '_is_tp', '_is_sl']].sum()
+            result_df['closed_trades'] = flag_sums['_is_closed'].astype(int)
+            result_df['tp_hits'] = flag_sums['_is_tp'].astype(int)
+            result_df['sl_hits'] = flag_sums['_is_sl'].astype(int)
+        else:
+            result_df[['closed_trades', 'tp_hits', 'sl_hits']] = 0
+        
+        # Win rate calculation
+        closed = result_df['closed_trades'].to_numpy()
+        result_df['win_rate'] = np.divide(
+            result_df['tp_hits'].to_numpy() * 100.0, closed,
+            out=np.zeros(len(result_df)), where=closed > 0
+        )
+        
+        # RR metrics
+        if 'rr_planned' in data.columns:
+            result_df['avg_rr'] = pair_groups['rr_planned'].mean().fillna(0)
+        else:
+            result_df['avg_rr'] = 0.0
+        
+        # Score calculation (for overall ranking)
+        result_df['score'] = calculate_pair_score_safe(result_df)
+        
+        result_df = result_df.reset_index()
+        result_df = result_df[result_df['pair'] != 'UNKNOWN'].reset_index(drop=True)
         
-        result_df = pd.DataFrame(metrics_list)
         st.success(f"✅ Calculated metrics for {len(result_df)} pairs")
         
         return result_df
@@ -124,13 +120,37 @@ def calculate_pair_metrics_safe(data):
         st.error(f"❌ Pair metrics calculation failed: {e}")
         return pd.DataFrame()
 
+def top_k_positions(values, k, mask=None):
+    """
+    Positions of the k largest values, best first (ties keep row order like nlargest)
+    
+    Uses a partial partition so only the selected k values get sorted; NaN values
+    and rows outside the optional boolean mask are never selected.
+    """
+    values = np.asarray(values, dtype=float)
+    eligible = ~np.isnan(values)
+    if mask is not None:
+        eligible &= mask
+    
+    candidates = np.flatnonzero(eligible)
+    if len(candidates) > k:
+        # k-th largest value; rows tied with it are taken in original order
+        kth = -np.partition(-values[candidates], k - 1)[k - 1]
+        above = values[candidates] > kth
+        ties = np.flatnonzero(values[candidates] == kth)[:k - above.sum()]
+        above[ties] = True
+        candidates = candidates[above]
+    
+    # Stable sort keeps the first occurrence ahead on ties, like keep='first'
+    return candidates[np.argsort(-values[candidates], kind='stable')]
+
 def calculate_pair_score_safe(metrics):
-    """Calculate overall score for ranking with safe handling"""
+    """Calculate overall score for ranking (works on a dict or a metrics frame)"""
     try:
         # Weighted scoring: Win rate (40%), Volume (30%), RR (30%)
         wr_score = metrics.get('win_rate', 0) * 0.4
-        volume_score = min(metrics.get('total_signals', 0) / 10, 100) * 0.3
-        rr_score = min(metrics.get('avg_rr', 0) * 20, 100) * 0.3
+        volume_score = np.minimum(metrics.get('total_signals', 0) / 10, 100) * 0.3
+        rr_score = np.minimum(metrics.get('avg_rr', 0) * 20, 100) * 0.3
         
         return wr_score + volume_score + rr_score
     except:
@@ -144,64 +164,15 @@ def render_top_coins_safe(pair_metrics):
             return
         
         # Filter and sort
-        top_pairs = pair_metrics[pair_metrics['total_signals'] >= 3].nlargest(20, 'score')
+        top_pairs = pair_metrics.iloc[top_k_positions(
+            pair_metrics['score'], 20, mask=pair_metrics['total_signals'].to_numpy() >= 3
+        )]
         
         if top_pairs.empty:
             st.info("Not enough data (minimum 3 signals required)")
             return
         
-        # Create horizontal bar chart with fixed layout
-        fig = go.Figure()
-        
-        # Add bars
-        colors = [get_score_color(score) for score in top_pairs['score']]
-        
-        fig.add_trace(go.Bar(
-            y=top_pairs['pair'][::-1],  # Reverse for top-to-bottom
-            x=top_pairs['score'][::-1],
-            orientation='h',
-            marker=dict(
-                color=colors[::-1],
-                line=dict(color='rgba(255,255,255,0.1)', width=1)
-            ),
-            text=[f"{score:.1f}" for score in top_pairs['score'][::-1]],
-            textposition='outside',
-            textfont=dict(color='white', size=10),
-            hovertemplate='%{y}<br>Score: %{x:.1f}<br>Signals: %{customdata}<extra></extra>',
-            customdata=top_pairs['total_signals'][::-1]
-        ))
-        
-        # Fixed layout - avoid duplicate xaxis parameter
-        layout_config = {
-            "template": "plotly_dark",
-            "paper_bgcolor": "#1A1D24",
-            "plot_bgcolor": "#1A1D24",
-            "title": {
-                "text": "Overall Performance Score (Top 20)",
-                "font": {"color": "#FFFFFF", "size": 16}
-            },
-            "font": {"color": "#FFFFFF"},
-            "height": max(400, len(top_pairs) * 25),
-            "margin": {"l": 100, "r": 50, "t": 60, "b": 50}
-        }
-        
-        # Set axis properties separately to avoid conflicts
-        layout_config["xaxis"] = {
-            "title": "Performance Score",
-            "range": [0, 100],
-            "gridcolor": "#2D3139",
-            "tickfont": {"color": "#A0A0A0"}
-        }
-        
-        layout_config["yaxis"] = {
-            "title": "",
-            "gridcolor": "#2D3139",
-            "tickfont": {"color": "#A0A0A0"}
-        }
-        
-        fig.update_layout(**layout_config)
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_top_coins_figure(top_pairs), use_container_width=True)
         
         # Show metrics table for top 10
         st.markdown("### 📊 Top 10 Details")
@@ -219,56 +190,15 @@ def render_top_winrate_safe(pair_metrics):
             return
         
         # Filter pairs with minimum trades
-        qualified = pair_metrics[pair_metrics['closed_trades'] >= 5].nlargest(15, 'win_rate')
+        qualified = pair_metrics.iloc[top_k_positions(
+            pair_metrics['win_rate'], 15, mask=pair_metrics['closed_trades'].to_numpy() >= 5
+        )]
         
         if qualified.empty:
             st.info("Not enough closed trades for analysis (minimum 5 required)")
             return
         
-        fig = go.Figure()
-        
-        # Color based on win rate
-        colors = [get_winrate_color(wr) for wr in qualified['win_rate']]
-        
-        fig.add_trace(go.Bar(
-            y=qualified['pair'][::-1],
-            x=qualified['win_rate'][::-1],
-            orientation='h',
-            marker=dict(color=colors[::-1]),
-            text=[f"{wr:.1f}%" for wr in qualified['win_rate'][::-1]],
-            textposition='outside',
-            textfont=dict(color='white', size=10),
-            hovertemplate='%{y}<br>Win Rate: %{x:.1f}%<br>Trades: %{customdata}<extra></extra>',
-            customdata=qualified['closed_trades'][::-1]
-        ))
-        
-        # Add 50% reference line
-        fig.add_vline(x=50, line_dash="dash", line_color=COLORS['text_muted'], opacity=0.5)
-        
-        # Fixed layout
-        fig.update_layout(
-            template="plotly_dark",
-            paper_bgcolor="#1A1D24",
-            plot_bgcolor="#1A1D24",
-            title={
-                "text": "Best Win Rate (Min 5 trades)",
-                "font": {"color": "#FFFFFF", "size": 16}
-            },
-            xaxis={
-                "title": "Win Rate (%)",
-                "range": [0, 100],
-                "gridcolor": "#2D3139"
-            },
-            yaxis={
-                "title": "",
-                "gridcolor": "#2D3139"
-            },
-            font={"color": "#FFFFFF"},
-            height=max(400, len(qualified) * 25),
-            margin={"l": 100, "r": 50, "t": 60, "b": 50}
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_top_winrate_figure(qualified), use_container_width=True)
         
     except Exception as e:
         st.error(f"❌ Win rate chart failed: {e}")
@@ -282,51 +212,15 @@ def render_top_rr_safe(pair_metrics):
             return
         
         # Filter pairs with RR data
-        qualified = pair_metrics[pair_metrics['avg_rr'] > 0].nlargest(15, 'avg_rr')
+        qualified = pair_metrics.iloc[top_k_positions(
+            pair_metrics['avg_rr'], 15, mask=pair_metrics['avg_rr'].to_numpy(dtype=float) > 0
+        )]
         
         if qualified.empty:
             st.info("No RR data available")
             return
         
-        fig = go.Figure()
-        
-        colors = [get_rr_color(rr) for rr in qualified['avg_rr']]
-        
-        fig.add_trace(go.Bar(
-            y=qualified['pair'][::-1],
-            x=qualified['avg_rr'][::-1],
-            orientation='h',
-            marker=dict(color=colors[::-1]),
-            text=[f"{rr:.2f}" for rr in qualified['avg_rr'][::-1]],
-            textposition='outside',
-            textfont=dict(color='white', size=10),
-            hovertemplate='%{y}<br>Avg RR: %{x:.2f}<br>Signals: %{customdata}<extra></extra>',
-            customdata=qualified['total_signals'][::-1]
-        ))
-        
-        # Fixed layout
-        fig.update_layout(
-            template="plotly_dark",
-            paper_bgcolor="#1A1D24",
-            plot_bgcolor="#1A1D24",
-            title={
-                "text": "Best Risk-Reward Ratios",
-                "font": {"color": "#FFFFFF", "size": 16}
-            },
-            xaxis={
-                "title": "Average RR Ratio",
-                "gridcolor": "#2D3139"
-            },
-            yaxis={
-                "title": "",
-                "gridcolor": "#2D3139"
-            },
-            font={"color": "#FFFFFF"},
-            height=max(400, len(qualified) * 25),
-            margin={"l": 100, "r": 50, "t": 60, "b": 50}
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_top_rr_figure(qualified), use_container_width=True)
         
     except Exception as e:
         st.error(f"❌ RR chart failed: {e}")
@@ -339,59 +233,203 @@ def render_most_active_safe(pair_metrics):
             st.info("No data available for activity analysis")
             return
         
-        top_active = pair_metrics.nlargest(15, 'total_signals')
+        top_active = pair_metrics.iloc[top_k_positions(pair_metrics['total_signals'], 15)]
         
         if top_active.empty:
             st.info("No activity data available")
             return
         
-        fig = go.Figure()
-        
-        # Gradient color based on volume
-        max_signals = top_active['total_signals'].max()
-        colors = [f"rgba(75, 155, 255, {0.3 + 0.7 * (s/max_signals)})" 
-                  for s in top_active['total_signals']]
-        
-        fig.add_trace(go.Bar(
-            y=top_active['pair'][::-1],
-            x=top_active['total_signals'][::-1],
-            orientation='h',
-            marker=dict(color=colors[::-1]),
-            text=top_active['total_signals'][::-1],
-            textposition='outside',
-            textfont=dict(color='white', size=10),
-            hovertemplate='%{y}<br>Signals: %{x}<br>Win Rate: %{customdata:.1f}%<extra></extra>',
-            customdata=top_active['win_rate'][::-1]
-        ))
-        
-        # Fixed layout
-        fig.update_layout(
-            template="plotly_dark",
-            paper_bgcolor="#1A1D24",
-            plot_bgcolor="#1A1D24",
-            title={
-                "text": "Most Active Pairs",
-                "font": {"color": "#FFFFFF", "size": 16}
-            },
-            xaxis={
-                "title": "Total Signals",
-                "gridcolor": "#2D3139"
-            },
-            yaxis={
-                "title": "",
-                "gridcolor": "#2D3139"
-            },
-            font={"color": "#FFFFFF"},
-            height=max(400, len(top_active) * 25),
-            margin={"l": 100, "r": 50, "t": 60, "b": 50}
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_most_active_figure(top_active), use_container_width=True)
         
     except Exception as e:
         st.error(f"❌ Activity chart failed: {e}")
         render_fallback_table(top_active if 'top_active' in locals() else pair_metrics, "total_signals", "Most Active Pairs")
 
+@st.cache_data(show_spinner=False)
+def build_top_coins_figure(top_pairs: pd.DataFrame) -> dict:
+    """Overall performance score bars, built once per distinct selection"""
+    # Reverse once for top-to-bottom ordering
+    pairs = top_pairs['pair'].to_numpy()[::-1]
+    scores = top_pairs['score'].to_numpy(dtype=float)[::-1]
+    signals = top_pairs['total_signals'].to_numpy()[::-1]
+    
+    # Build the figure from one dict spec on top of the shared theme layout
+    fig = go.Figure({
+        "data": [{
+            "type": "bar",
+            "y": pairs,
+            "x": scores,
+            "orientation": "h",
+            "marker": {
+                "color": get_score_colors(scores),
+                "line": {"color": "rgba(255,255,255,0.1)", "width": 1}
+            },
+            "text": np.char.mod("%.1f", scores),
+            "textposition": "outside",
+            "textfont": {"color": "white", "size": 10},
+            "hovertemplate": "%{y}<br>Score: %{x:.1f}<br>Signals: %{customdata}<extra></extra>",
+            "customdata": signals
+        }],
+        "layout": BASE_LAYOUT
+    })
+    
+    # Only the chart-specific keys are layered over the shared theme layout
+    fig.update_layout({
+        "title": {
+            "text": "Overall Performance Score (Top 20)",
+            "font": {"color": "#FFFFFF", "size": 16}
+        },
+        "xaxis": {
+            "title": "Performance Score",
+            "range": [0, 100]
+        },
+        "yaxis": {
+            "title": ""
+        },
+        "height": max(400, len(top_pairs) * 25),
+        "margin": {"l": 100, "r": 50, "t": 60, "b": 50}
+    })
+    
+    return fig.to_dict()
+
+@st.cache_data(show_spinner=False)
+def build_top_winrate_figure(qualified: pd.DataFrame) -> dict:
+    """Win rate bars with the 50% reference line, built once per distinct selection"""
+    # Reverse once for top-to-bottom ordering
+    pairs = qualified['pair'].to_numpy()[::-1]
+    winrates = qualified['win_rate'].to_numpy(dtype=float)[::-1]
+    trades = qualified['closed_trades'].to_numpy()[::-1]
+    
+    fig = go.Figure({
+        "data": [{
+            "type": "bar",
+            "y": pairs,
+            "x": winrates,
+            "orientation": "h",
+            "marker": {"color": get_winrate_colors(winrates)},
+            "text": np.char.mod("%.1f%%", winrates),
+            "textposition": "outside",
+            "textfont": {"color": "white", "size": 10},
+            "hovertemplate": "%{y}<br>Win Rate: %{x:.1f}%<br>Trades: %{customdata}<extra></extra>",
+            "customdata": trades
+        }],
+        "layout": BASE_LAYOUT
+    })
+    
+    # Only the chart-specific keys are layered over the shared theme layout
+    fig.update_layout({
+        "title": {
+            "text": "Best Win Rate (Min 5 trades)",
+            "font": {"color": "#FFFFFF", "size": 16}
+        },
+        "xaxis": {
+            "title": "Win Rate (%)",
+            "range": [0, 100]
+        },
+        "yaxis": {
+            "title": ""
+        },
+        "height": max(400, len(qualified) * 25),
+        "margin": {"l": 100, "r": 50, "t": 60, "b": 50},
+        # 50% reference line
+        "shapes": [{
+            "type": "line",
+            "xref": "x", "x0": 50, "x1": 50,
+            "yref": "paper", "y0": 0, "y1": 1,
+            "line": {"dash": "dash", "color": COLORS['text_muted']},
+            "opacity": 0.5
+        }]
+    })
+    
+    return fig.to_dict()
+
+@st.cache_data(show_spinner=False)
+def build_top_rr_figure(qualified: pd.DataFrame) -> dict:
+    """Average RR bars, built once per distinct selection"""
+    # Reverse once for top-to-bottom ordering
+    pairs = qualified['pair'].to_numpy()[::-1]
+    avg_rrs = qualified['avg_rr'].to_numpy(dtype=float)[::-1]
+    signals = qualified['total_signals'].to_numpy()[::-1]
+    
+    fig = go.Figure({
+        "data": [{
+            "type": "bar",
+            "y": pairs,
+            "x": avg_rrs,
+            "orientation": "h",
+            "marker": {"color": get_rr_colors(avg_rrs)},
+            "text": np.char.mod("%.2f", avg_rrs),
+            "textposition": "outside",
+            "textfont": {"color": "white", "size": 10},
+            "hovertemplate": "%{y}<br>Avg RR: %{x:.2f}<br>Signals: %{customdata}<extra></extra>",
+            "customdata": signals
+        }],
+        "layout": BASE_LAYOUT
+    })
+    
+    # Only the chart-specific keys are layered over the shared theme layout
+    fig.update_layout({
+        "title": {
+            "text": "Best Risk-Reward Ratios",
+            "font": {"color": "#FFFFFF", "size": 16}
+        },
+        "xaxis": {
+            "title": "Average RR Ratio"
+        },
+        "yaxis": {
+            "title": ""
+        },
+        "height": max(400, len(qualified) * 25),
+        "margin": {"l": 100, "r": 50, "t": 60, "b": 50}
+    })
+    
+    return fig.to_dict()
+
+@st.cache_data(show_spinner=False)
+def build_most_active_figure(top_active: pd.DataFrame) -> dict:
+    """Signal count bars shaded by volume, built once per distinct selection"""
+    # Reverse once for top-to-bottom ordering
+    pairs = top_active['pair'].to_numpy()[::-1]
+    signals = top_active['total_signals'].to_numpy()[::-1]
+    winrates = top_active['win_rate'].to_numpy()[::-1]
+    
+    # Gradient color based on volume
+    colors = np.char.mod("rgba(75, 155, 255, %.3f)", 0.3 + 0.7 * (signals / signals.max()))
+    
+    fig = go.Figure({
+        "data": [{
+            "type": "bar",
+            "y": pairs,
+            "x": signals,
+            "orientation": "h",
+            "marker": {"color": colors},
+            "text": signals,
+            "textposition": "outside",
+            "textfont": {"color": "white", "size": 10},
+            "hovertemplate": "%{y}<br>Signals: %{x}<br>Win Rate: %{customdata:.1f}%<extra></extra>",
+            "customdata": winrates
+        }],
+        "layout": BASE_LAYOUT
+    })
+    
+    # Only the chart-specific keys are layered over the shared theme layout
+    fig.update_layout({
+        "title": {
+            "text": "Most Active Pairs",
+            "font": {"color": "#FFFFFF", "size": 16}
+        },
+        "xaxis": {
+            "title": "Total Signals"
+        },
+        "yaxis": {
+            "title": ""
+        },
+        "height": max(400, len(top_active) * 25),
+        "margin": {"l": 100, "r": 50, "t": 60, "b": 50}
+    })
+    
+    return fig.to_dict()
+
 def display_top_table_safe(df):
     """Display formatted table for top performers with error handling"""
     try:
@@ -402,16 +440,10 @@ def display_top_table_safe(df):
         display_df = df[['pair', 'total_signals', 'win_rate', 'avg_rr', 'score']].copy()
         display_df.columns = ['Pair', 'Signals', 'Win Rate %', 'Avg RR', 'Score']
         
-        # Format columns safely
-        display_df['Win Rate %'] = display_df['Win Rate %'].apply(
-            lambda x: f"{x:.1f}%" if pd.notna(x) else "N/A"
-        )
-        display_df['Avg RR'] = display_df['Avg RR'].apply(
-            lambda x: f"{x:.2f}" if pd.notna(x) else "N/A"
-        )
-        display_df['Score'] = display_df['Score'].apply(
-            lambda x: f"{x:.1f}" if pd.notna(x) else "N/A"
-        )
+        # Format columns safely - one vectorized pass per column
+        for col, fmt in (('Win Rate %', '%.1f%%'), ('Avg RR', '%.2f'), ('Score', '%.1f')):
+            values = display_df[col].to_numpy(dtype=float)
+            display_df[col] = np.where(np.isnan(values), "N/A", np.char.mod(fmt, values))
         
         st.dataframe(
             display_df,
@@ -451,40 +483,29 @@ def render_fallback_table(df, sort_column, title):
     except Exception as e:
         st.error(f"❌ Fallback table failed: {e}")
 
-def get_score_color(score):
-    """Get color based on performance score"""
-    try:
-        if score >= 70:
-            return COLORS['green']
-        elif score >= 50:
-            return COLORS['yellow']
-        elif score >= 30:
-            return COLORS['blue']
-        else:
-            return COLORS['red']
-    except:
-        return "#4B9BFF"  # Default blue
+def get_score_colors(scores):
+    """Bar colors for a sequence of performance scores (green >= 70, yellow >= 50, blue >= 30, else red)"""
+    s = np.asarray(scores, dtype=float)
+    return np.select(
+        [s >= 70, s >= 50, s >= 30],
+        [COLORS['green'], COLORS['yellow'], COLORS['blue']],
+        default=COLORS['red']
+    )
 
-def get_winrate_color(winrate):
-    """Get color for winrate"""
-    try:
-        if winrate >= 60:
-            return COLORS['green']
-        elif winrate >= 40:
-            return COLORS['yellow']
-        else:
-            return COLORS['red']
-    except:
-        return "#FDB32B"  # Default yellow
+def get_winrate_colors(winrates):
+    """Bar colors for a sequence of winrates (green >= 60, yellow >= 40, else red)"""
+    wr = np.asarray(winrates, dtype=float)
+    return np.select(
+        [wr >= 60, wr >= 40],
+        [COLORS['green'], COLORS['yellow']],
+        default=COLORS['red']
+    )
 
-def get_rr_color(rr):
-    """Get color for RR ratio"""
-    try:
-        if rr >= 3:
-            return COLORS['green']
-        elif rr >= 2:
-            return COLORS['yellow']
-        else:
-            return COLORS['red']
-    except:
-        return "#FDB32B"  # Default yellow
\ No newline at end of file
+def get_rr_colors(rrs):
+    """Bar colors for a sequence of RR ratios (green >= 3, yellow >= 2, else red)"""
+    rr = np.asarray(rrs, dtype=float)
+    return np.select(
+        [rr >= 3, rr >= 2],
+        [COLORS['green'], COLORS['yellow']],
+        default=COLORS['red']
+    )
@@ -2,14 +2,16 @@
 Winrate display components
 """
 import streamlit as st
-import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
+import numpy as np
+from utils.helpers import add_outcome_flags
 from data_processing.winrate_calculator import (
     calculate_period_winrates, 
     calculate_winrate_trend,
     get_winrate_summary_stats,
-    calculate_rolling_winrate
+    calculate_rolling_winrate,
+    linear_fit
 )
 
 def render_winrate_section(data):
@@ -54,55 +56,53 @@ def render_winrate_section(data):
 
 def render_winrate_trendline_chart(winrate_data, period_name):
     """Render winrate trendline chart"""
-    fig = go.Figure()
-    
     # Main winrate line
-    fig.add_trace(go.Scatter(
-        x=winrate_data['period_date'],
-        y=winrate_data['winrate'],
-        mode='lines+markers',
-        name='Win Rate',
-        line=dict(color='#2E86AB', width=3),
-        marker=dict(size=8),
-        hovertemplate='Period: %{x}<br>Win Rate: %{y:.1f}%<br>Trades: %{customdata}<extra></extra>',
-        customdata=winrate_data['total_trades']
-    ))
+    traces = [{
+        'type': 'scattergl',
+        'x': winrate_data['period_date'],
+        'y': winrate_data['winrate'],
+        'mode': 'lines+markers',
+        'name': 'Win Rate',
+        'line': {'color': '#2E86AB', 'width': 3},
+        'marker': {'size': 8},
+        'hovertemplate': 'Period: %{x}<br>Win Rate: %{y:.1f}%<br>Trades: %{customdata}<extra></extra>',
+        'customdata': winrate_data['total_trades']
+    }]
     
     # Add trendline
     if len(winrate_data) >= 2:
-        trend_info = calculate_winrate_trend(winrate_data)
+        # Simple linear trendline (least-squares fit over the period index)
+        y = winrate_data['winrate'].to_numpy(dtype=float)
+        x_numeric = np.arange(len(y))
+        valid = ~np.isnan(y)
         
-        # Simple linear trendline
-        x_numeric = list(range(len(winrate_data)))
-        z = pd.Series(winrate_data['winrate']).interpolate()
-        trendline = z.rolling(window=min(3, len(z)), center=True).mean()
+        if valid.sum() >= 2:
+            slope, intercept = linear_fit(x_numeric[valid], y[valid])
+            trendline = slope * x_numeric + intercept
+        else:
+            trendline = y
         
-        fig.add_trace(go.Scatter(
-            x=winrate_data['period_date'],
-            y=trendline,
-            mode='lines',
-            name='Trend',
-            line=dict(color='#F18F01', width=2, dash='dot'),
-            opacity=0.7
-        ))
-    
-    # Add 50% reference line
-    fig.add_hline(
-        y=50, 
-        line_dash="dash", 
-        line_color="gray", 
-        opacity=0.5,
-        annotation_text="Break Even (50%)"
-    )
-    
-    fig.update_layout(
-        title=f"Win Rate Trend - {period_name}",
-        xaxis_title="Time Period",
-        yaxis_title="Win Rate (%)",
-        yaxis=dict(range=[0, 100]),
-        hovermode='x unified',
-        showlegend=True
-    )
+        traces.append({
+            'type': 'scattergl',
+            'x': winrate_data['period_date'],
+            'y': trendline,
+            'mode': 'lines',
+            'name': 'Trend',
+            'line': {'color': '#F18F01', 'width': 2, 'dash': 'dot'},
+            'opacity': 0.7
+        })
+    
+    fig = go.Figure({
+        'data': traces,
+        'layout': {
+            'title': f"Win Rate Trend - {period_name}",
+            'xaxis': {'title': "Time Period"},
+            'yaxis': {'title': "Win Rate (%)", 'range': [0, 100]},
+            'hovermode': 'x unified',
+            'showlegend': True,
+            **break_even_line("Break Even (50%)")
+        }
+    })
     
     st.plotly_chart(fig, use_container_width=True)
 
@@ -132,10 +132,13 @@ def render_winrate_stats(data, winrate_data):
         'SL': stats['sl_count']
     }
     
-    for outcome, count in tp_data.items():
-        if count > 0:
-            percentage = (count / stats['total_trades'] * 100)
-            st.write(f"• {outcome}: {count} ({percentage:.1f}%)")
+    # One markdown block instead of a write call per outcome
+    lines = [
+        f"• {outcome}: {count} ({count / stats['total_trades'] * 100:.1f}%)"
+        for outcome, count in tp_data.items() if count > 0
+    ]
+    if lines:
+        st.markdown("  \n".join(lines))
     
     # Trend analysis
     if not winrate_data.empty:
@@ -152,11 +155,13 @@ def render_winrate_stats(data, winrate_data):
         }
         
         trend_icon = trend_colors.get(trend_info['trend'], '⚪')
-        st.write(f"{trend_icon} **{trend_info['trend'].title()}**")
+        trend_lines = [f"{trend_icon} **{trend_info['trend'].title()}**"]
         
         if trend_info['trend'] != 'insufficient_data':
-            st.write(f"Slope: {trend_info['slope']:.3f}%/period")
-            st.write(f"Recent: {trend_info['current_winrate']:.1f}%")
+            trend_lines.append(f"Slope: {trend_info['slope']:.3f}%/period")
+            trend_lines.append(f"Recent: {trend_info['current_winrate']:.1f}%")
+        
+        st.markdown("  \n".join(trend_lines))
 
 def render_rolling_winrate(data):
     """Render rolling winrate chart"""
@@ -168,34 +173,28 @@ def render_rolling_winrate(data):
         st.info("Insufficient data for rolling winrate")
         return
     
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatter(
-        x=rolling_data['created_at'],
-        y=rolling_data['rolling_winrate'],
-        mode='lines',
-        name='30-Trade Rolling Win Rate',
-        line=dict(color='#A23B72', width=2),
-        fill='tonexty',
-        fillcolor='rgba(162, 59, 114, 0.1)'
-    ))
-    
-    # Add 50% reference line
-    fig.add_hline(
-        y=50,
-        line_dash="dash",
-        line_color="gray",
-        opacity=0.5,
-        annotation_text="Break Even"
-    )
-    
-    fig.update_layout(
-        title="Rolling Win Rate Over Time",
-        xaxis_title="Date",
-        yaxis_title="Win Rate (%)",
-        yaxis=dict(range=[0, 100]),
-        showlegend=False
-    )
+    # Long histories are downsampled so the browser payload stays bounded
+    x_plot, y_plot = downsample_minmax(rolling_data['created_at'], rolling_data['rolling_winrate'])
+    
+    fig = go.Figure({
+        'data': [{
+            'type': 'scattergl',
+            'x': x_plot,
+            'y': y_plot,
+            'mode': 'lines',
+            'name': '30-Trade Rolling Win Rate',
+            'line': {'color': '#A23B72', 'width': 2},
+            'fill': 'tonexty',
+            'fillcolor': 'rgba(162, 59, 114, 0.1)'
+        }],
+        'layout': {
+            'title': "Rolling Win Rate Over Time",
+            'xaxis': {'title': "Date"},
+            'yaxis': {'title': "Win Rate (%)", 'range': [0, 100]},
+            'showlegend': False,
+            **break_even_line("Break Even")
+        }
+    })
     
     st.plotly_chart(fig, use_container_width=True)
     
@@ -213,50 +212,97 @@ def render_rolling_winrate(data):
             max_rolling = rolling_data['rolling_winrate'].max()
             st.metric("Peak Rolling WR", f"{max_rolling:.1f}%")
 
+def downsample_minmax(x, y, max_points=1000):
+    """
+    Reduce a long series to roughly max_points by keeping each bucket's min and max
+    
+    Peaks and troughs survive, so the line shape is preserved while the number
+    of points serialized to the browser no longer grows with the history.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= max_points:
+        return x, y
+    
+    bucket = int(np.ceil(n / (max_points // 2)))
+    n_buckets = int(np.ceil(n / bucket))
+    
+    padded = np.full(n_buckets * bucket, np.nan)
+    padded[:n] = y
+    blocks = padded.reshape(n_buckets, bucket)
+    offsets = np.arange(n_buckets) * bucket
+    
+    lows = offsets + np.argmin(np.where(np.isnan(blocks), np.inf, blocks), axis=1)
+    highs = offsets + np.argmax(np.where(np.isnan(blocks), -np.inf, blocks), axis=1)
+    
+    keep = np.unique(np.concatenate([lows, highs, [0, n - 1]]))
+    keep = keep[keep < n]
+    
+    return np.asarray(x)[keep], y[keep]
+
+def break_even_line(label):
+    """Layout shapes/annotations for the dashed 50% reference line"""
+    return {
+        'shapes': [{
+            'type': 'line',
+            'xref': 'paper', 'x0': 0, 'x1': 1,
+            'yref': 'y', 'y0': 50, 'y1': 50,
+            'line': {'dash': 'dash', 'color': 'gray'},
+            'opacity': 0.5
+        }],
+        'annotations': [{
+            'text': label,
+            'xref': 'paper', 'x': 1, 'xanchor': 'right',
+            'yref': 'y', 'y': 50, 'yanchor': 'bottom',
+            'showarrow': False
+        }]
+    }
+
 def render_winrate_heatmap(data):
     """Render winrate heatmap by day/hour"""
     if data is None or data.empty or 'created_at' not in data.columns:
         return
     
-    closed_df = data[data['final_outcome'].notna() & (data['final_outcome'] != 'open')].copy()
+    data = add_outcome_flags(data)
+    closed_df = data[data['_is_closed']].copy()
     
     if closed_df.empty:
         return
     
     st.subheader("Win Rate Heatmap by Time")
     
-    # Extract hour and day of week
-    closed_df['hour'] = closed_df['created_at'].dt.hour
-    closed_df['day_of_week'] = closed_df['created_at'].dt.day_name()
-    closed_df['is_winner'] = closed_df['final_outcome'].str.startswith('tp', na=False)
-    
-    # Calculate winrate by hour and day
-    heatmap_data = closed_df.groupby(['day_of_week', 'hour']).agg({
-        'is_winner': ['sum', 'count']
-    }).reset_index()
-    
-    heatmap_data.columns = ['day_of_week', 'hour', 'wins', 'total']
-    heatmap_data['winrate'] = (heatmap_data['wins'] / heatmap_data['total'] * 100).round(1)
-    
-    # Create pivot table for heatmap
-    heatmap_pivot = heatmap_data.pivot(index='day_of_week', columns='hour', values='winrate')
-    
-    # Reorder days
+    # Extract hour and day of week (ordered categorical keeps days in calendar order)
     day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    heatmap_pivot = heatmap_pivot.reindex(day_order)
-    
-    # Create heatmap
-    fig = px.imshow(
-        heatmap_pivot,
-        labels=dict(x="Hour of Day", y="Day of Week", color="Win Rate %"),
-        color_continuous_scale="RdYlGn",
-        aspect="auto"
+    closed_df['hour'] = closed_df['created_at'].dt.hour
+    closed_df['day_of_week'] = pd.Categorical(
+        closed_df['created_at'].dt.day_name(), categories=day_order, ordered=True
     )
-    
-    fig.update_layout(
-        title="Win Rate by Day of Week and Hour",
-        xaxis_title="Hour of Day (UTC)",
-        yaxis_title="Day of Week"
+
+    # Wins and totals per day/hour cell, already pivoted
+    wins = pd.crosstab(
+        closed_df['day_of_week'], closed_df['hour'],
+        values=closed_df['_is_tp'], aggfunc='sum'
     )
+    totals = pd.crosstab(closed_df['day_of_week'], closed_df['hour'])
+
+    heatmap_pivot = (wins / totals * 100).round(1).reindex(day_order)
     
-    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+    # Create heatmap
+    fig = go.Figure({
+        'data': [{
+            'type': 'heatmap',
+            'z': heatmap_pivot.to_numpy(),
+            'x': heatmap_pivot.columns.to_numpy(),
+            'y': heatmap_pivot.index.to_numpy(),
+            'colorscale': 'RdYlGn',
+            'colorbar': {'title': {'text': "Win Rate %"}},
+            'hovertemplate': 'Hour of Day: %{x}<br>Day of Week: %{y}<br>Win Rate %: %{z}<extra></extra>'
+        }],
+        'layout': {
+            'title': "Win Rate by Day of Week and Hour",
+            'xaxis': {'title': "Hour of Day (UTC)"},
+            'yaxis': {'title': "Day of Week", 'autorange': 'reversed'}
+        }
+    })
+    
+    st.plotly_chart(fig, use_container_width=True)
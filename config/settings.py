@@ -15,6 +15,12 @@ TABLE_MAPPINGS = {
     "fills": ["executions", "fills", "signal_fills"]
 }
 
+# Raw message columns no page reads; left out of the SELECT when loading tables
+UNUSED_COLUMNS = {
+    "raw_text", "text_sha1", "message_link", "edit_date",
+    "linked_msg_id", "reply_to_msg_id"
+}
+
 # Column name mappings for flexible data handling
 COLUMN_MAPPINGS = {
     "created_at": ["created_at", "timestamp", "time", "date"],
@@ -23,6 +29,12 @@ COLUMN_MAPPINGS = {
     "time": ["update_at", "created_at", "timestamp", "time"]
 }
 
+# Tables only needed in reduced form, loaded as SELECT DISTINCT over these
+# columns: outcome inference just needs which update types each signal reached
+DISTINCT_LOADS = {
+    "updates": ["signal_id"] + COLUMN_MAPPINGS["update_type"]
+}
+
 # Required columns for signals table
 REQUIRED_SIGNAL_COLUMNS = [
     "signal_id", "pair", "entry", "target1", "target2", 
@@ -38,6 +50,9 @@ OUTCOME_RANKING = {
     "tp4": 4
 }
 
+# Categories for the final_outcome categorical dtype
+OUTCOME_CATEGORIES = list(OUTCOME_RANKING.keys()) + ["open"]
+
 # Chart colors
 CHART_COLORS = {
     "primary": "#1f77b4",
@@ -51,5 +66,6 @@ CHART_COLORS = {
 DISPLAY_SETTINGS = {
     "decimal_places": 4,
     "min_pair_signals": 3,  # Minimum signals required to show pair stats
-    "top_pairs_limit": 15   # Max pairs to show in charts
+    "top_pairs_limit": 15,  # Max pairs to show in charts
+    "show_processing_status": True  # Show data standardization progress notices
 }
\ No newline at end of file
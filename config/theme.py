@@ -1,9 +1,13 @@
 """
 Dark theme configuration for LuxQuant Analyzer
 """
+import re
+from types import MappingProxyType
 
-# Color Palette
-COLORS = {
+import plotly.graph_objects as go
+
+# Color Palette (read-only so shared layouts built from it stay consistent)
+COLORS = MappingProxyType({
     # Primary colors
     "background": "#0E1117",
     "card_bg": "#1A1D24",
@@ -34,10 +38,10 @@ COLORS = {
     "danger": "#FF4747",
     "warning": "#FDB32B",
     "info": "#4B9BFF",
-}
+})
 
 # Custom CSS for dark theme
-CUSTOM_CSS = """
+_RAW_CSS = """
 <style>
 /* Main app background */
 .stApp {
@@ -187,8 +191,11 @@ h1, h2, h3 {
 </style>
 """
 
+# Minified once at import - pages re-send this string on every rerun
+CUSTOM_CSS = re.sub(r"\s+", " ", re.sub(r"/\*.*?\*/", "", _RAW_CSS, flags=re.S)).strip()
+
 # Plotly dark theme configuration
-PLOTLY_CONFIG = {
+PLOTLY_CONFIG = MappingProxyType({
     "template": "plotly_dark",
     "paper_bgcolor": "#1A1D24",
     "plot_bgcolor": "#1A1D24",
@@ -207,7 +214,10 @@ PLOTLY_CONFIG = {
         "tickfont": {"color": "#A0A0A0"}
     },
     "colorway": ["#00D46A", "#FF4747", "#FDB32B", "#4B9BFF", "#9D5CFF"]
-}
+})
+
+# Validated once at import; charts layer their own title/axes/height on top
+BASE_LAYOUT = go.Layout(**PLOTLY_CONFIG)
 
 # Chart specific configs
 CHART_CONFIGS = {
@@ -1,16 +1,120 @@
 """
 Enhanced Data Standardization Module with better datetime handling
 """
+import re
 import pandas as pd
 import numpy as np
 from datetime import datetime
 import logging
 import streamlit as st
+from utils.helpers import parse_datetime_column, PYARROW_AVAILABLE, STRING_DTYPE
+from config.settings import DISPLAY_SETTINGS
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+# Module logger only; handlers/levels are configured by the app entry point
 logger = logging.getLogger(__name__)
 
+# Outcome label -> TP level; anything else (sl, open, missing) is level 0
+TP_LEVEL_MAP = {'tp1': 1, 'tp2': 2, 'tp3': 3, 'tp4': 4}
+
+# Alternative spellings of outcome labels (lowercased, stripped) -> canonical label
+OUTCOME_ALIASES = {
+    'tp_1': 'tp1', 'tp 1': 'tp1', 'target1': 'tp1', 'target 1': 'tp1',
+    'tp_2': 'tp2', 'tp 2': 'tp2', 'target2': 'tp2', 'target 2': 'tp2',
+    'tp_3': 'tp3', 'tp 3': 'tp3', 'target3': 'tp3', 'target 3': 'tp3',
+    'tp_4': 'tp4', 'tp 4': 'tp4', 'target4': 'tp4', 'target 4': 'tp4',
+    'stop': 'sl', 'stoploss': 'sl', 'stop loss': 'sl', 'stop_loss': 'sl'
+}
+
+# Update-type matchers, compiled once: TP level -> pattern, plus stop loss
+TP_UPDATE_PATTERNS = {level: re.compile(f'tp ?{level}|target ?{level}') for level in (4, 3, 2, 1)}
+SL_UPDATE_PATTERN = re.compile('sl|stop')
+
+# Source column name variations -> standard column name
+COLUMN_ALIASES = {
+    # Time columns (multiple variations)
+    'timestamp': 'created_at',
+    'time': 'created_at',
+    'date': 'created_at',
+    'create_time': 'created_at',
+    'creation_date': 'created_at',
+    
+    # Pair columns
+    'symbol': 'pair',
+    'ticker': 'pair',
+    'coin': 'pair',
+    'trading_pair': 'pair',
+    'currency_pair': 'pair',
+    
+    # Price columns
+    'entry_price': 'entry',
+    'buy_price': 'entry',
+    
+    # Target columns
+    'tp1': 'target1',
+    'tp2': 'target2',
+    'tp3': 'target3',
+    'tp4': 'target4',
+    'take_profit_1': 'target1',
+    'take_profit_2': 'target2',
+    'take_profit_3': 'target3',
+    'take_profit_4': 'target4',
+    
+    # Stop loss columns
+    'sl': 'stop1',
+    'sl1': 'stop1',
+    'sl2': 'stop2',
+    'stop_loss': 'stop1',
+    'stoploss': 'stop1'
+}
+
+# Separators folded to underscores when normalizing column names
+_COLUMN_NAME_TRANS = str.maketrans({' ': '_', '-': '_'})
+
+# Standard signal schema (column -> logical type)
+STANDARD_COLUMNS = {
+    'signal_id': 'string',
+    'pair': 'string', 
+    'created_at': 'datetime',
+    'entry': 'price',
+    'target1': 'price',
+    'target2': 'price',
+    'target3': 'price',
+    'target4': 'price',
+    'stop1': 'price',
+    'stop2': 'price',
+    'final_outcome': 'string',
+    'tp_level': 'level',
+    'rr_planned': 'float',
+    'is_open': 'boolean',
+    'is_winner': 'boolean'
+}
+
+# Concrete pandas dtypes for the standard schema, resolved once
+# (prices stay float64: RR ratios are derived from their differences; tp_level is 0-4)
+_PANDAS_DTYPES = {
+    'string': STRING_DTYPE,
+    'datetime': 'datetime64[ns]',
+    'price': 'float64',
+    'float': 'float64',
+    'level': 'int8',
+    'boolean': 'bool'
+}
+EMPTY_SIGNAL_DTYPES = {col: _PANDAS_DTYPES[kind] for col, kind in STANDARD_COLUMNS.items()}
+
+# Dtype predicates per logical type, used to recognise already-standardized frames
+_LOGICAL_TYPE_CHECKS = {
+    'string': lambda dtype: (
+        pd.api.types.is_object_dtype(dtype)
+        or pd.api.types.is_string_dtype(dtype)
+        or isinstance(dtype, pd.CategoricalDtype)
+    ),
+    'datetime': pd.api.types.is_datetime64_dtype,
+    'price': pd.api.types.is_float_dtype,
+    'float': pd.api.types.is_float_dtype,
+    'level': pd.api.types.is_integer_dtype,
+    'boolean': pd.api.types.is_bool_dtype
+}
+
 def process_signals(raw_data):
     """
     Enhanced signal processing with better error handling and datetime standardization
@@ -46,11 +150,14 @@ def process_signals(raw_data):
             
             if not outcomes_df.empty:
                 # Merge outcomes with signals
-                df_processed = df_processed.merge(
-                    outcomes_df[['signal_id', 'final_outcome', 'tp_level']], 
-                    on='signal_id', 
-                    how='left'
-                )
+                # Outcomes are unique per signal_id: join against their index
+                df_processed = df_processed.join(
+                    outcomes_df.set_index('signal_id')[['final_outcome', 'tp_level']],
+                    on='signal_id',
+                    how='left',
+                    lsuffix='_x',
+                    rsuffix='_y'
+                ).reset_index(drop=True)
                 st.success(f"✅ Added outcomes for {outcomes_df['signal_id'].nunique()} signals")
             else:
                 st.warning("⚠️ No outcomes could be processed from updates")
@@ -72,177 +179,188 @@ def process_signals(raw_data):
         st.exception(e)
         return pd.DataFrame()
 
+def create_empty_signals_df():
+    """Empty frame with the standard signal schema, built in one constructor call"""
+    return pd.DataFrame(columns=list(EMPTY_SIGNAL_DTYPES)).astype(EMPTY_SIGNAL_DTYPES)
+
+def report_status(messages):
+    """
+    Log a function's progress messages and show them as one Streamlit notice
+    
+    The notice is controlled by DISPLAY_SETTINGS['show_processing_status'],
+    independently of how logging is configured.
+    """
+    if not messages:
+        return
+    
+    for message in messages:
+        logger.info(message)
+    
+    if DISPLAY_SETTINGS.get("show_processing_status", True):
+        st.info("  \n".join(messages))
+
+def conforms_to_standard_schema(df):
+    """True if every standard column is present with a matching dtype (metadata-only check)"""
+    dtypes = df.dtypes
+    return all(
+        col in dtypes.index and _LOGICAL_TYPE_CHECKS[kind](dtypes[col])
+        for col, kind in STANDARD_COLUMNS.items()
+    )
+
 def standardize_signals_data(df):
     """Enhanced signal data standardization"""
     if df is None or df.empty:
-        return pd.DataFrame()
+        return create_empty_signals_df()
+    
+    # Frames that already went through standardization (e.g. from cache)
+    # are returned as-is instead of being reprocessed
+    if conforms_to_standard_schema(df):
+        return df
+    
+    logger.info("Standardizing signals data: %d rows, %d columns", len(df), len(df.columns))
     
+    status = []
     try:
-        # Step 1: Create working copy
-        df_clean = df.copy()
-        
-        st.info("🔧 Standardizing column names...")
-        
-        # Step 2: Normalize column names
-        column_mappings = {
-            # Time columns (multiple variations)
-            'timestamp': 'created_at',
-            'time': 'created_at',
-            'date': 'created_at',
-            'create_time': 'created_at',
-            'creation_date': 'created_at',
-            
-            # Pair columns
-            'symbol': 'pair',
-            'ticker': 'pair',
-            'coin': 'pair',
-            'trading_pair': 'pair',
-            'currency_pair': 'pair',
-            
-            # Price columns
-            'entry_price': 'entry',
-            'buy_price': 'entry',
-            
-            # Target columns
-            'tp1': 'target1',
-            'tp2': 'target2', 
-            'tp3': 'target3',
-            'tp4': 'target4',
-            'take_profit_1': 'target1',
-            'take_profit_2': 'target2',
-            'take_profit_3': 'target3',
-            'take_profit_4': 'target4',
-            
-            # Stop loss columns
-            'sl': 'stop1',
-            'sl1': 'stop1',
-            'sl2': 'stop2',
-            'stop_loss': 'stop1',
-            'stoploss': 'stop1'
-        }
+        status.append("🔧 Standardizing column names...")
+        
+        # Step 1: Normalize column names - lowercase/snake_case plus alias
+        # lookup in one mapping, so the frame is renamed exactly once. rename
+        # returns a new frame, which doubles as the working copy
+        final_map = {}
+        for col in df.columns:
+            normalized = str(col).strip().lower().translate(_COLUMN_NAME_TRANS)
+            final_map[col] = COLUMN_ALIASES.get(normalized, normalized)
         
-        # Apply column mappings
-        df_clean = df_clean.rename(columns=column_mappings)
+        df_clean = df.rename(columns=final_map)
         
-        st.info("📅 Standardizing datetime columns...")
+        status.append("📅 Standardizing datetime columns...")
         
-        # Step 3: Handle datetime column with enhanced processing
+        # Step 2: Handle datetime column with enhanced processing
         if 'created_at' in df_clean.columns:
             df_clean = standardize_datetime_column(df_clean, 'created_at')
         else:
             st.warning("⚠️ No datetime column found - using current time")
             df_clean['created_at'] = datetime.now()
         
-        st.info("🏷️ Processing pair information...")
+        status.append("🏷️ Processing pair information...")
         
-        # Step 4: Standardize pair column
+        # Step 3: Standardize pair column
         if 'pair' in df_clean.columns:
-            df_clean['pair'] = df_clean['pair'].astype(str).str.upper().str.strip()
-            df_clean['pair'] = df_clean['pair'].replace(['NAN', 'NONE', 'NULL'], 'UNKNOWN')
+            # Clean each distinct pair once, then gather back by factor code;
+            # the trailing entry maps missing values (code -1) to UNKNOWN
+            codes, uniques = pd.factorize(df_clean['pair'])
+            labels = pd.Series(uniques, dtype=object).astype(STRING_DTYPE).str.upper().str.strip()
+            labels = labels.mask(labels.isna() | labels.isin(['NAN', 'NONE', 'NULL']), 'UNKNOWN')
+            lookup = np.append(labels.to_numpy(dtype=object), 'UNKNOWN')
+            df_clean['pair'] = pd.array(lookup[codes], dtype=STRING_DTYPE)
         else:
             df_clean['pair'] = 'UNKNOWN'
         
-        st.info("🔢 Ensuring required columns...")
-        
-        # Step 5: Ensure all standard columns exist
-        standard_columns = {
-            'signal_id': 'string',
-            'pair': 'string', 
-            'created_at': 'datetime',
-            'entry': 'float',
-            'target1': 'float',
-            'target2': 'float', 
-            'target3': 'float',
-            'target4': 'float',
-            'stop1': 'float',
-            'stop2': 'float',
-            'final_outcome': 'string',
-            'tp_level': 'int',
-            'rr_planned': 'float',
-            'is_open': 'boolean',
-            'is_winner': 'boolean'
-        }
-        
-        for col, dtype in standard_columns.items():
+        status.append("🔢 Ensuring required columns...")
+        
+        # Step 4: Ensure all standard columns exist - missing ones are built
+        # as typed arrays and attached with a single assign
+        n_rows = len(df_clean)
+        missing_columns = {}
+        for col, dtype in STANDARD_COLUMNS.items():
             if col not in df_clean.columns:
-                if col == 'signal_id' and col not in df_clean.columns:
+                if col == 'signal_id':
                     # Generate signal IDs if missing
-                    df_clean['signal_id'] = [f"SIG_{i:06d}" for i in range(len(df_clean))]
-                elif dtype == 'float':
-                    df_clean[col] = np.nan
-                elif dtype == 'int':
-                    df_clean[col] = 0
+                    missing_columns[col] = pd.array(
+                        np.char.add('SIG_', np.char.zfill(np.arange(n_rows).astype(str), 6)),
+                        dtype=STRING_DTYPE if PYARROW_AVAILABLE else object
+                    )
+                elif dtype in ('float', 'price'):
+                    missing_columns[col] = np.full(n_rows, np.nan, dtype=EMPTY_SIGNAL_DTYPES[col])
+                elif dtype == 'level':
+                    missing_columns[col] = np.zeros(n_rows, dtype=np.int8)
                 elif dtype == 'string':
-                    df_clean[col] = None
+                    missing_columns[col] = np.full(n_rows, None, dtype=object)
                 elif dtype == 'boolean':
-                    df_clean[col] = False
+                    missing_columns[col] = np.zeros(n_rows, dtype=bool)
+        
+        if missing_columns:
+            df_clean = df_clean.assign(**missing_columns)
         
-        st.info("🧹 Cleaning and validating data...")
+        status.append("🧹 Cleaning and validating data...")
         
-        # Step 6: Clean price data
+        # Step 5: Clean price data
         price_columns = ['entry', 'target1', 'target2', 'target3', 'target4', 'stop1', 'stop2']
-        for col in price_columns:
-            if col in df_clean.columns:
-                # Convert to numeric
-                df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce')
-                # Remove unrealistic values
-                df_clean.loc[df_clean[col] <= 0, col] = np.nan
-                df_clean.loc[df_clean[col] > 1000000, col] = np.nan
-        
-        # Step 7: Remove completely empty rows
-        df_clean = df_clean.dropna(how='all')
-        
-        # Step 8: Remove duplicate signal IDs
-        if 'signal_id' in df_clean.columns:
-            initial_count = len(df_clean)
-            df_clean = df_clean.drop_duplicates(subset=['signal_id'], keep='first')
-            if len(df_clean) < initial_count:
-                st.info(f"🔄 Removed {initial_count - len(df_clean)} duplicate signals")
+        present_prices = [col for col in price_columns if col in df_clean.columns]
+        if present_prices:
+            # Convert to numeric and validate the whole price block at once
+            prices = df_clean[present_prices].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64, copy=True)
+            # Remove unrealistic values
+            np.putmask(prices, (prices <= 0) | (prices > 1000000), np.nan)
+            df_clean[present_prices] = prices
+        
+        # Step 6: Remove completely empty rows and duplicate signal IDs with
+        # one combined mask, so rows are filtered in a single pass
+        keep_mask = ~df_clean.isna().all(axis=1).to_numpy()
+        
+        # Generated IDs are unique by construction, only source IDs can repeat
+        if 'signal_id' in df_clean.columns and 'signal_id' not in missing_columns:
+            duplicate_mask = df_clean['signal_id'].duplicated(keep='first').to_numpy() & keep_mask
+            keep_mask &= ~duplicate_mask
+            duplicate_count = int(duplicate_mask.sum())
+            if duplicate_count:
+                status.append(f"🔄 Removed {duplicate_count} duplicate signals")
+        
+        # Positional take avoids the index alignment of a boolean .loc
+        if not keep_mask.all():
+            df_clean = df_clean.iloc[np.flatnonzero(keep_mask)]
+        
+        # Few distinct pairs: store codes so groupbys/filters hash integers
+        df_clean['pair'] = df_clean['pair'].astype('category')
         
         return df_clean
         
     except Exception as e:
         st.error(f"❌ Standardization failed: {e}")
-        return pd.DataFrame()
+        return create_empty_signals_df()
+    
+    finally:
+        report_status(status)
 
 def standardize_datetime_column(df, col):
     """
     Enhanced datetime standardization to prevent comparison errors
     """
+    status = []
     try:
-        st.info(f"📅 Converting {col} to proper datetime format...")
-        
-        # Handle different datetime formats
-        original_values = df[col].copy()
-        
-        # Method 1: Direct pandas conversion with UTC
-        try:
-            df[col] = pd.to_datetime(df[col], errors='coerce', utc=True)
-            success_count = df[col].notna().sum()
-            st.info(f"✅ Converted {success_count}/{len(df)} datetime values")
-        except Exception as e1:
-            st.warning(f"Primary datetime conversion failed: {e1}")
-            
-            # Method 2: Try without UTC
+        status.append(f"📅 Converting {col} to proper datetime format...")
+        
+        # Already-parsed columns (e.g. from a cached frame) skip the parser
+        if not pd.api.types.is_datetime64_any_dtype(df[col]):
+            # Method 1: Direct pandas conversion with UTC
             try:
-                df[col] = pd.to_datetime(df[col], errors='coerce')
+                df[col] = parse_datetime_column(df[col], utc=True)
                 success_count = df[col].notna().sum()
-                st.info(f"✅ Fallback conversion successful: {success_count}/{len(df)}")
-            except Exception as e2:
-                st.error(f"Both datetime conversions failed: {e2}")
-                # Fallback to current time
-                df[col] = datetime.now()
+                status.append(f"✅ Converted {success_count}/{len(df)} datetime values")
+            except Exception as e1:
+                st.warning(f"Primary datetime conversion failed: {e1}")
+                
+                # Method 2: Try without UTC
+                try:
+                    df[col] = pd.to_datetime(df[col], errors='coerce')
+                    success_count = df[col].notna().sum()
+                    status.append(f"✅ Fallback conversion successful: {success_count}/{len(df)}")
+                except Exception as e2:
+                    st.error(f"Both datetime conversions failed: {e2}")
+                    # Fallback to current time
+                    df[col] = datetime.now()
         
         # Remove timezone info to prevent comparison issues
-        if df[col].dtype.name.startswith('datetime') and hasattr(df[col].dtype, 'tz') and df[col].dtype.tz is not None:
-            df[col] = df[col].dt.tz_localize(None)
-            st.info("🌍 Removed timezone information to prevent comparison errors")
+        if isinstance(df[col].dtype, pd.DatetimeTZDtype):
+            df[col] = df[col].dt.tz_convert(None)
+            status.append("🌍 Removed timezone information to prevent comparison errors")
         
-        # Fill any remaining NaT values
-        nat_count = df[col].isna().sum()
-        if nat_count > 0:
-            st.warning(f"⚠️ Filling {nat_count} missing datetime values with current time")
-            df[col] = df[col].fillna(datetime.now())
+        # Fill any remaining NaT values - the fill (and the clock read) only
+        # happens when something actually failed to parse
+        nat_mask = df[col].isna().to_numpy()
+        if nat_mask.any():
+            st.warning(f"⚠️ Filling {nat_mask.sum()} missing datetime values with current time")
+            df[col] = df[col].fillna(pd.Timestamp(datetime.now()))
         
         return df
         
@@ -251,6 +369,9 @@ def standardize_datetime_column(df, col):
         # Ultimate fallback
         df[col] = datetime.now()
         return df
+    
+    finally:
+        report_status(status)
 
 def process_signal_outcomes(df_updates):
     """Process outcomes from updates data"""
@@ -261,21 +382,35 @@ def process_signal_outcomes(df_updates):
         st.info("🎯 Processing signal outcomes...")
         
         # Basic outcome inference
-        outcome_data = []
+        outcomes_df = pd.DataFrame()
         
-        # Group by signal_id if available
+        # Rank every update once (tp4..tp1 -> 4..1, sl -> 0, anything else -1)
+        # and keep the best rank per signal_id in a single groupby
         if 'signal_id' in df_updates.columns and 'update_type' in df_updates.columns:
-            for signal_id in df_updates['signal_id'].unique():
-                signal_updates = df_updates[df_updates['signal_id'] == signal_id]
-                outcome = infer_outcome_from_updates(signal_updates)
-                outcome_data.append({
-                    'signal_id': signal_id,
-                    'final_outcome': outcome['outcome'],
-                    'tp_level': outcome['tp_level']
-                })
-        
-        if outcome_data:
-            outcomes_df = pd.DataFrame(outcome_data)
+            update_types = df_updates['update_type'].str.lower().str.strip()
+            conditions = [
+                update_types.str.contains(pattern, na=False)
+                for pattern in TP_UPDATE_PATTERNS.values()
+            ]
+            conditions.append(update_types.str.contains(SL_UPDATE_PATTERN, na=False))
+            ranks = pd.Series(
+                np.select(conditions, [4, 3, 2, 1, 0], default=-1),
+                index=df_updates.index
+            )
+            # Sorted keys leave outcomes with a monotonic signal_id index,
+            # which the join in process_signals probes more cheaply
+            best_rank = ranks.groupby(df_updates['signal_id']).max()
+            
+            # Position rank + 1 in this table: -1 (no match) stays open
+            outcome_names = np.array([None, 'sl', 'tp1', 'tp2', 'tp3', 'tp4'], dtype=object)
+            best = best_rank.to_numpy()
+            outcomes_df = pd.DataFrame({
+                'signal_id': best_rank.index,
+                'final_outcome': outcome_names[best + 1],
+                'tp_level': np.maximum(best, 0)
+            })
+        
+        if not outcomes_df.empty:
             st.success(f"✅ Processed outcomes for {len(outcomes_df)} signals")
             return outcomes_df
         else:
@@ -297,13 +432,11 @@ def infer_outcome_from_updates(updates):
         
         # Check for TP hits (priority order)
         for tp_level in [4, 3, 2, 1]:
-            tp_patterns = [f'tp{tp_level}', f'tp {tp_level}', f'target {tp_level}', f'target{tp_level}']
-            if update_types.str.contains('|'.join(tp_patterns), na=False).any():
+            if update_types.str.contains(TP_UPDATE_PATTERNS[tp_level], na=False).any():
                 return {'outcome': f'tp{tp_level}', 'tp_level': tp_level}
         
         # Check for SL hit
-        sl_patterns = ['sl', 'stop', 'stop loss', 'stoploss']
-        if update_types.str.contains('|'.join(sl_patterns), na=False).any():
+        if update_types.str.contains(SL_UPDATE_PATTERN, na=False).any():
             return {'outcome': 'sl', 'tp_level': 0}
         
         # Default to open
@@ -314,76 +447,118 @@ def infer_outcome_from_updates(updates):
 
 def add_calculated_fields(df):
     """Add calculated fields with error handling"""
+    status = []
     try:
-        st.info("🔢 Adding calculated fields...")
+        status.append("🔢 Adding calculated fields...")
         
-        # Add is_open flag
         if 'final_outcome' in df.columns:
-            df['is_open'] = df['final_outcome'].isna() | (df['final_outcome'] == 'open') | (df['final_outcome'] == '')
+            # Low-cardinality outcome labels are stored as a categorical, so
+            # every flag below is resolved once per category and gathered by
+            # code; the trailing slot is what missing values (code -1) read
+            outcome = normalize_outcome_labels(df['final_outcome'])
+            df['final_outcome'] = outcome
+            categories = pd.Series(outcome.cat.categories)
+            codes = outcome.cat.codes.to_numpy()
+            
+            level_by_code = np.zeros(len(categories) + 1, dtype=np.int8)
+            level_by_code[:-1] = categories.map(TP_LEVEL_MAP).fillna(0)
+            open_by_code = np.append(categories.isin(['open', '']).to_numpy(), True)
+            
+            outcome_levels = level_by_code[codes]
+            df['is_open'] = open_by_code[codes]
         else:
+            outcome_levels = np.zeros(len(df), dtype=np.int8)
             df['is_open'] = True
         
-        # Add is_winner flag  
-        if 'final_outcome' in df.columns:
-            df['is_winner'] = df['final_outcome'].str.startswith('tp', na=False)
-        else:
-            df['is_winner'] = False
+        # Add is_winner flag
+        df['is_winner'] = outcome_levels > 0
         
         # Calculate TP level if not already present
         if 'tp_level' not in df.columns or df['tp_level'].isna().all():
-            df['tp_level'] = 0
-            if 'final_outcome' in df.columns:
-                for i in range(1, 5):
-                    mask = df['final_outcome'] == f'tp{i}'
-                    df.loc[mask, 'tp_level'] = i
+            df['tp_level'] = outcome_levels
         
         # Calculate RR ratios
         df = calculate_rr_ratios(df)
         
-        st.success("✅ Added calculated fields successfully")
+        status.append("✅ Added calculated fields successfully")
         
         return df
         
     except Exception as e:
         st.error(f"❌ Failed to add calculated fields: {e}")
         return df
+    
+    finally:
+        report_status(status)
+
+def normalize_outcome_labels(outcome):
+    """
+    Canonicalize outcome labels as a categorical
+    
+    Lowercasing, stripping and alias lookup run once per distinct label; rows
+    are then re-encoded with an integer gather, so the cost in strings is O(K)
+    rather than O(N).
+    """
+    outcome = outcome.astype('category')
+    labels = outcome.cat.categories.astype(str).str.lower().str.strip()
+    canonical = np.array([OUTCOME_ALIASES.get(label, label) for label in labels], dtype=object)
+    
+    # Aliases can collapse several labels into one category; the trailing -1
+    # keeps missing values (code -1) missing
+    categories, code_map = np.unique(canonical, return_inverse=True)
+    code_map = np.append(code_map.reshape(-1), -1)
+    new_codes = code_map[outcome.cat.codes.to_numpy()]
+    
+    return pd.Series(
+        pd.Categorical.from_codes(new_codes, categories=categories),
+        index=outcome.index,
+        name=outcome.name
+    )
 
 def calculate_rr_ratios(df):
     """Calculate risk-reward ratios"""
+    status = []
     try:
         if not all(col in df.columns for col in ['entry', 'stop1']):
             st.warning("⚠️ Missing required columns for RR calculation")
             df['rr_planned'] = np.nan
             return df
         
-        # Use stop1 as primary, fallback to stop2
-        df['stop_used'] = df['stop1'].fillna(df['stop2'])
-        
-        # Calculate risk distance (entry to stop)
-        df['risk_distance'] = abs(df['entry'] - df['stop_used'])
+        # Intermediates stay local numpy arrays so no temporary columns have
+        # to be added to (and dropped from, with a full copy) the frame
+        entry = df['entry'].to_numpy(dtype=np.float64)
         
-        # Find highest target
-        target_cols = ['target4', 'target3', 'target2', 'target1']
-        df['highest_target'] = np.nan
-        
-        for target_col in target_cols:
-            if target_col in df.columns:
-                mask = df[target_col].notna() & df['highest_target'].isna()
-                df.loc[mask, 'highest_target'] = df.loc[mask, target_col]
+        # Use stop1 as primary, fallback to stop2
+        stop_used = df['stop1'].fillna(df['stop2']).to_numpy(dtype=np.float64)
+        
+        # Calculate risk distance (entry to stop), abs taken in place
+        risk_distance = np.subtract(entry, stop_used)
+        np.abs(risk_distance, out=risk_distance)
+        
+        # Highest target = last non-missing of target1..target4, picked for
+        # every row at once from the stacked 2-D block
+        target_cols = [col for col in ['target1', 'target2', 'target3', 'target4'] if col in df.columns]
+        if target_cols:
+            targets = df[target_cols].to_numpy(dtype=np.float64)
+            last_valid = (~np.isnan(targets)).cumsum(axis=1).argmax(axis=1)
+            highest_target = np.take_along_axis(targets, last_valid[:, None], axis=1)[:, 0]
+        else:
+            highest_target = np.full(len(df), np.nan)
         
         # Calculate planned RR
-        reward_distance = abs(df['highest_target'] - df['entry'])
-        df['rr_planned'] = np.where(
-            (df['risk_distance'] > 0) & df['risk_distance'].notna() & reward_distance.notna(),
-            reward_distance / df['risk_distance'],
-            np.nan
+        reward_distance = np.subtract(highest_target, entry)
+        np.abs(reward_distance, out=reward_distance)
+        
+        # Divide straight into a NaN-filled buffer, only where RR is defined
+        rr_planned = np.full(len(df), np.nan)
+        np.divide(
+            reward_distance, risk_distance, out=rr_planned,
+            where=(risk_distance > 0) & ~np.isnan(reward_distance)
         )
-        
-        # Clean up temporary columns
-        df = df.drop(columns=['stop_used', 'risk_distance', 'highest_target'], errors='ignore')
+        df['rr_planned'] = rr_planned
         
         rr_count = df['rr_planned'].notna().sum()
-        st.info(f"📊 Calculated RR for {rr_count} signals")
+        status.append(f"📊 Calculated RR for {rr_count} signals")
         
         return df
         
@@ -392,11 +567,15 @@ def calculate_rr_ratios(df):
         if 'rr_planned' not in df.columns:
             df['rr_planned'] = np.nan
         return df
+    
+    finally:
+        report_status(status)
 
 def final_data_cleanup(df):
     """Final data cleanup and validation"""
+    status = []
     try:
-        st.info("🧹 Final data cleanup...")
+        status.append("🧹 Final data cleanup...")
         
         # Remove rows with no essential data
         essential_cols = ['signal_id', 'pair']
@@ -405,7 +584,7 @@ def final_data_cleanup(df):
                 initial_len = len(df)
                 df = df[df[col].notna()]
                 if len(df) < initial_len:
-                    st.info(f"🗑️ Removed {initial_len - len(df)} rows with missing {col}")
+                    status.append(f"🗑️ Removed {initial_len - len(df)} rows with missing {col}")
         
         # Sort by created_at if available
         if 'created_at' in df.columns:
@@ -414,10 +593,13 @@ def final_data_cleanup(df):
         # Reset index
         df = df.reset_index(drop=True)
         
-        st.success(f"🎉 Final cleanup complete: {len(df)} clean signals ready")
+        status.append(f"🎉 Final cleanup complete: {len(df)} clean signals ready")
         
         return df
         
     except Exception as e:
         st.warning(f"⚠️ Final cleanup had issues: {e}")
-        return df
\ No newline at end of file
+        return df
+    
+    finally:
+        report_status(status)
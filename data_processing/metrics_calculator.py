@@ -4,6 +4,9 @@ Comprehensive metrics calculation for trading signals
 import pandas as pd
 import numpy as np
 
+from config.settings import OUTCOME_CATEGORIES
+from utils.helpers import is_tp_outcome
+
 def compute_comprehensive_metrics(signals, outcomes=None):
     """
     Compute comprehensive signal metrics including RR ratios
@@ -18,7 +21,9 @@ def compute_comprehensive_metrics(signals, outcomes=None):
     if signals is None or signals.empty:
         return pd.DataFrame()
 
-    df = signals.copy()
+    # Shallow copy: every step below assigns whole columns, never writes into
+    # the caller's arrays, so duplicating the data buffers is unnecessary
+    df = signals.copy(deep=False)
     
     # Ensure all required columns exist
     required_cols = ["signal_id", "pair", "entry", "target1", "target2", "target3", "target4", "stop1", "stop2"]
@@ -31,23 +36,31 @@ def compute_comprehensive_metrics(signals, outcomes=None):
     
     # Merge with outcomes if provided
     if outcomes is not None and not outcomes.empty:
-        df = df.merge(outcomes, on="signal_id", how="left")
+        # Outcomes are one row per signal_id, so probe their index directly
+        # instead of hashing both sides; suffixes match the old merge
+        df = df.join(
+            outcomes.set_index("signal_id"), on="signal_id", how="left",
+            lsuffix="_x", rsuffix="_y"
+        ).reset_index(drop=True)
         df = calculate_performance_metrics(df)
     
     return df
 
 def calculate_rr_metrics(df):
     """Calculate risk-reward ratios for all targets"""
+    # Intermediates stay local float arrays; only the RR results become columns
+    entry = df["entry"].to_numpy(dtype=np.float64, na_value=np.nan)
+    
     # Calculate stop loss used (prefer stop1, fallback to stop2)
-    df["stop_used"] = np.where(df["stop1"].notna(), df["stop1"], df["stop2"])
+    stop1 = df["stop1"].to_numpy(dtype=np.float64, na_value=np.nan)
+    stop_used = np.where(np.isnan(stop1), df["stop2"].to_numpy(dtype=np.float64, na_value=np.nan), stop1)
     
-    # Find highest available target
-    df["highest_target"] = get_highest_target(df)
+    # Calculate risk distance (entry to stop), abs in place
+    risk_distance = np.subtract(entry, stop_used)
+    np.fabs(risk_distance, out=risk_distance)
     
-    # Calculate risk distance (entry to stop)
-    entry_col = df["entry"]
-    stop_col = df["stop_used"]
-    df["risk_distance"] = np.abs(entry_col - stop_col)
+    # One reward buffer is reused for every target
+    reward_distance = np.empty_like(entry)
     
     # Calculate individual target RR ratios
     for i in range(1, 5):
@@ -55,43 +68,56 @@ def calculate_rr_metrics(df):
         rr_col = f"rr_target{i}"
         
         if target_col in df.columns:
-            reward_distance = np.abs(df[target_col] - entry_col)
-            df[rr_col] = calculate_rr_ratio(reward_distance, df["risk_distance"])
+            np.subtract(df[target_col].to_numpy(dtype=np.float64, na_value=np.nan), entry, out=reward_distance)
+            np.fabs(reward_distance, out=reward_distance)
+            df[rr_col] = calculate_rr_ratio(reward_distance, risk_distance)
     
-    # Overall planned RR (using highest target)
-    if "highest_target" in df.columns:
-        reward_distance = np.abs(df["highest_target"] - entry_col)
-        df["rr_planned"] = calculate_rr_ratio(reward_distance, df["risk_distance"])
+    # Overall planned RR (using highest available target)
+    np.subtract(get_highest_target(df), entry, out=reward_distance)
+    np.fabs(reward_distance, out=reward_distance)
+    df["rr_planned"] = calculate_rr_ratio(reward_distance, risk_distance)
     
     return df
 
 def get_highest_target(df):
     """Find the highest available target for each signal"""
-    highest_target = np.full(len(df), np.nan)
-    
-    # Check targets in descending order
-    for target_col in ["target4", "target3", "target2", "target1"]:
-        if target_col in df.columns:
-            mask = df[target_col].notna() & pd.isna(highest_target)
-            highest_target[mask] = df.loc[mask, target_col]
-    
+    # First non-missing value scanning target4 -> target1, taken for all
+    # rows at once from the stacked 2-D block
+    target_cols = [col for col in ["target4", "target3", "target2", "target1"] if col in df.columns]
+    if not target_cols:
+        return np.full(len(df), np.nan)
+    
+    targets = df[target_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    present = ~np.isnan(targets)
+    first_present = present.argmax(axis=1)
+    highest_target = targets[np.arange(len(df)), first_present]
+    
+    # argmax lands on column 0 for rows without any target; that value is NaN anyway
     return highest_target
 
 def calculate_rr_ratio(reward_distance, risk_distance):
-    """Calculate risk-reward ratio safely"""
-    return np.where(
-        (risk_distance > 0) & (risk_distance.notna()) & (reward_distance.notna()),
-        reward_distance / risk_distance,
-        np.nan
+    """Calculate risk-reward ratio safely (float32 - ratios need no more precision)"""
+    reward_distance = np.asarray(reward_distance, dtype=np.float64)
+    risk_distance = np.asarray(risk_distance, dtype=np.float64)
+    
+    # Divide straight into a NaN-filled float32 buffer, only where RR is defined
+    rr = np.full(len(risk_distance), np.nan, dtype=np.float32)
+    np.divide(
+        reward_distance, risk_distance, out=rr,
+        where=(risk_distance > 0) & ~np.isnan(reward_distance)
     )
+    return rr
 
 def calculate_performance_metrics(df):
     """Calculate performance metrics when outcomes are available"""
+    # Categorical outcome: the comparisons below run on integer codes
+    df["final_outcome"] = df["final_outcome"].astype(pd.CategoricalDtype(categories=OUTCOME_CATEGORIES))
+    
     # Realized RR (actual RR achieved)
     df["rr_realized"] = calculate_realized_rr(df)
     
     # Performance flags
-    df["is_winner"] = df["final_outcome"].str.startswith("tp", na=False)
+    df["is_winner"] = is_tp_outcome(df["final_outcome"])
     df["is_loser"] = df["final_outcome"] == "sl"
     df["is_open"] = df["final_outcome"].isna() | (df["final_outcome"] == "open")
     
@@ -99,7 +125,7 @@ def calculate_performance_metrics(df):
 
 def calculate_realized_rr(df):
     """Calculate the actual RR ratio achieved based on outcome"""
-    realized_rr = np.full(len(df), np.nan)
+    realized_rr = np.full(len(df), np.nan, dtype=np.float32)
     
     # For TP outcomes, use the corresponding target RR
     for i in range(1, 5):
@@ -138,20 +164,22 @@ def calculate_portfolio_metrics(df):
         else:
             metrics["win_rate"] = 0
     
-    # RR metrics
+    # RR metrics - all statistics of a column from one agg call
     if "rr_planned" in df.columns:
         rr_data = df["rr_planned"].dropna()
         if len(rr_data) > 0:
-            metrics["avg_rr_planned"] = rr_data.mean()
-            metrics["median_rr_planned"] = rr_data.median()
-            metrics["min_rr_planned"] = rr_data.min()
-            metrics["max_rr_planned"] = rr_data.max()
+            rr_stats = rr_data.agg(["mean", "median", "min", "max"])
+            metrics["avg_rr_planned"] = rr_stats["mean"]
+            metrics["median_rr_planned"] = rr_stats["median"]
+            metrics["min_rr_planned"] = rr_stats["min"]
+            metrics["max_rr_planned"] = rr_stats["max"]
     
     if "rr_realized" in df.columns:
         rr_realized = df["rr_realized"].dropna()
         if len(rr_realized) > 0:
-            metrics["avg_rr_realized"] = rr_realized.mean()
-            metrics["total_realized_rr"] = rr_realized.sum()
+            rr_stats = rr_realized.agg(["mean", "sum"])
+            metrics["avg_rr_realized"] = rr_stats["mean"]
+            metrics["total_realized_rr"] = rr_stats["sum"]
     
     return metrics
 
@@ -160,16 +188,41 @@ def calculate_pair_metrics(df):
     if df is None or df.empty or "pair" not in df.columns:
         return pd.DataFrame()
     
-    # Group by pair and calculate metrics
-    pair_groups = df.groupby("pair")
+    # Group by pair once; every per-pair metric is a column-wise aggregation
+    # in the same shape calculate_portfolio_metrics returns for one group
+    pair_groups = df.groupby("pair", observed=True)
+    
+    pair_metrics = pd.DataFrame({"total_signals": pair_groups.size()})
+    
+    if "is_open" in df.columns:
+        pair_metrics["open_signals"] = pair_groups["is_open"].sum()
+        pair_metrics.insert(1, "closed_trades", pair_metrics["total_signals"] - pair_metrics["open_signals"])
+    else:
+        pair_metrics["closed_trades"] = 0
+        pair_metrics["open_signals"] = pair_metrics["total_signals"]
     
-    pair_stats = []
-    for pair, group in pair_groups:
-        stats = calculate_portfolio_metrics(group)
-        stats["pair"] = pair
-        pair_stats.append(stats)
+    if "is_winner" in df.columns and "is_loser" in df.columns:
+        pair_metrics["tp_hits"] = pair_groups["is_winner"].sum()
+        pair_metrics["sl_hits"] = pair_groups["is_loser"].sum()
+        
+        # Win rate
+        closed_trades = pair_metrics["closed_trades"].to_numpy()
+        pair_metrics["win_rate"] = np.divide(
+            pair_metrics["tp_hits"].to_numpy() * 100, closed_trades,
+            out=np.zeros(len(pair_metrics)), where=closed_trades > 0
+        )
+    
+    # RR metrics (NaN for pairs without any RR data)
+    if "rr_planned" in df.columns:
+        rr_planned = pair_groups["rr_planned"].agg(["mean", "median", "min", "max"])
+        pair_metrics[["avg_rr_planned", "median_rr_planned", "min_rr_planned", "max_rr_planned"]] = rr_planned.to_numpy()
+    
+    if "rr_realized" in df.columns:
+        pair_metrics["avg_rr_realized"] = pair_groups["rr_realized"].mean()
+        pair_metrics["total_realized_rr"] = pair_groups["rr_realized"].sum(min_count=1)
     
-    pair_metrics = pd.DataFrame(pair_stats)
+    pair_metrics["pair"] = pair_metrics.index.to_numpy()
+    pair_metrics = pair_metrics.reset_index(drop=True)
     
     # Sort by win rate (descending) and total signals
     if "win_rate" in pair_metrics.columns:
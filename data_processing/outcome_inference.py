@@ -1,11 +1,17 @@
 """
 Signal outcome inference from updates data
 """
+import re
 import pandas as pd
 import numpy as np
 from config.settings import OUTCOME_RANKING, COLUMN_MAPPINGS
 from utils.helpers import safe_col, ensure_datetime
 
+# Vectorized update-type matchers (same rules as normalize_update_type), compiled once
+TP_TYPE_PATTERNS = {level: re.compile(f"tp{level}|target ?{level}|t{level}") for level in (4, 3, 2, 1)}
+SL_TYPE_PATTERN = re.compile("sl|stop")
+HIT_TYPE_PATTERN = re.compile("hit|reached")
+
 def infer_outcome_from_updates(updates):
     """
     Infer final outcome from signal updates with comprehensive pattern matching
@@ -19,10 +25,8 @@ def infer_outcome_from_updates(updates):
     if updates is None or updates.empty:
         return pd.DataFrame(columns=["signal_id", "final_outcome", "tp_level"])
 
-    upd = updates.copy()
-    
-    # Find and normalize time column
-    upd = prepare_updates_data(upd)
+    # Shallow copy is enough: only whole columns are added or replaced below
+    upd = updates.copy(deep=False)
     
     # Find update_type column
     type_col = safe_col(upd, COLUMN_MAPPINGS["update_type"])
@@ -34,7 +38,15 @@ def infer_outcome_from_updates(updates):
         return pd.DataFrame(columns=["signal_id", "final_outcome", "tp_level"])
 
     # Normalize update types
-    upd["update_type_norm"] = upd["update_type"].apply(normalize_update_type)
+    upd["update_type_norm"] = normalize_update_types(upd["update_type"])
+    
+    # Nothing rankable (e.g. only unclassified update types): skip the
+    # datetime parsing, sort and groupby entirely
+    if not upd["update_type_norm"].isin(list(OUTCOME_RANKING)).any():
+        return pd.DataFrame(columns=["signal_id", "final_outcome", "tp_level"])
+    
+    # Find and normalize time column
+    upd = prepare_updates_data(upd)
     
     # Calculate final outcomes
     final_outcomes = calculate_final_outcomes(upd)
@@ -109,6 +121,43 @@ def normalize_update_type(update_value):
     
     return s
 
+def normalize_update_types(update_types):
+    """
+    Vectorized normalize_update_type over a whole Series
+    
+    Update types repeat heavily, so the column is factorized and only the
+    distinct values are classified: each pattern class is one regex scan over
+    them and np.select applies the same priority order as the scalar version
+    (direct TP mentions, then SL, then "hit"/"reached" followed by a level
+    number). Rows are filled back by code.
+    
+    Args:
+        update_types: Series of raw update type values
+        
+    Returns:
+        Series of normalized update types (tp1..tp4, sl, the cleaned original, or None)
+    """
+    codes, uniques = pd.factorize(update_types)
+    s = pd.Series(uniques, dtype=object).astype(str).str.lower().str.strip()
+    
+    levels = list(TP_TYPE_PATTERNS)
+    direct_tp = [s.str.contains(TP_TYPE_PATTERNS[level], na=False) for level in levels]
+    is_sl = s.str.contains(SL_TYPE_PATTERN, na=False)
+    hit_or_reached = s.str.contains(HIT_TYPE_PATTERN, na=False)
+    level_after_hit = [hit_or_reached & s.str.contains(str(level), regex=False, na=False) for level in levels]
+    
+    tp_names = [f"tp{level}" for level in levels]
+    normalized = np.select(
+        direct_tp + [is_sl] + level_after_hit,
+        tp_names + ["sl"] + tp_names,
+        default=s.to_numpy(dtype=object)
+    ).astype(object)
+    
+    # Missing values (code -1) pick up the trailing None
+    normalized = np.append(normalized, None)[codes]
+    
+    return pd.Series(normalized, index=update_types.index, name=update_types.name)
+
 def calculate_final_outcomes(upd):
     """Calculate final outcomes for each signal"""
     # Ranking system based on outcome hierarchy
@@ -119,7 +168,8 @@ def calculate_final_outcomes(upd):
     if valid_updates.empty:
         return pd.DataFrame(columns=["signal_id", "final_outcome", "tp_level"])
         
-    # Group by signal and get maximum rank achieved
+    # Group by signal and get maximum rank achieved; groupby's sorted keys
+    # give the outcomes a monotonic signal_id for the join downstream
     agg = valid_updates.groupby("signal_id").agg(
         max_rank=("rank", "max")
     ).reset_index()
@@ -6,75 +6,138 @@ import numpy as np
 from datetime import datetime, timedelta
 import streamlit as st
 
+from utils.helpers import is_tp_outcome, tp_label_mask, parse_datetime_column
+
+# Columns the winrate calculations read from the closed-trade view
+CLOSED_VIEW_COLUMNS = ['signal_id', 'created_at', 'final_outcome']
+
+# Relative time ranges are measured from "now" rounded down to this many seconds
+NOW_BUCKET_SECONDS = 600
+
+def get_closed_view(df):
+    """
+    Closed trades with standardized dates and an is_winner flag, sorted by date
+    
+    Built per call: gathering the three columns takes a couple of
+    milliseconds, less than fingerprinting the frame to reuse a view safely.
+    """
+    # Work on column arrays and gather the kept rows once, already in date order,
+    # instead of copying the frame and then filtering, assigning and sorting it
+    created_at = standardize_datetime_values(df['created_at'])
+    is_closed, is_winner = outcome_flags(df['final_outcome'])
+    
+    # Processed frames already carry is_winner from the metrics step
+    if 'is_winner' in df.columns and pd.api.types.is_bool_dtype(df['is_winner']):
+        is_winner = df['is_winner'].to_numpy(dtype=bool)
+    
+    keep = np.flatnonzero(is_closed & created_at.notna().to_numpy())
+    keep = keep[np.argsort(created_at.to_numpy()[keep], kind='stable')]
+    
+    columns = {
+        col: created_at if col == 'created_at' else df[col]
+        for col in CLOSED_VIEW_COLUMNS if col in df.columns
+    }
+    closed_df = pd.DataFrame(
+        {col: values.array.take(keep) for col, values in columns.items()},
+        index=df.index[keep]
+    )
+    closed_df['is_winner'] = is_winner[keep]
+    
+    return closed_df
+
+def outcome_flags(outcome):
+    """
+    Closed-trade and winner masks for a final_outcome Series, as numpy arrays
+    
+    Categorical outcomes are classified once per category and gathered by
+    code; the trailing False in each lookup is what missing values (code -1)
+    pick up.
+    """
+    if isinstance(outcome.dtype, pd.CategoricalDtype):
+        categories = outcome.cat.categories
+        codes = outcome.cat.codes.to_numpy()
+        closed_by_code = np.append(~categories.isin(['open', '']), False)
+        winner_by_code = np.append(tp_label_mask(categories), False)
+        return closed_by_code[codes], winner_by_code[codes]
+    
+    is_closed = (outcome.notna() & (outcome != 'open') & (outcome != '')).to_numpy()
+    return is_closed, is_tp_outcome(outcome).to_numpy()
+
 def calculate_period_winrates(df, period='D', time_range='all'):
     """
     Calculate winrate per period with proper time range filtering
     
     Args:
         df: DataFrame with signals data
-        period: 'D' for daily, 'W' for weekly, 'M' for monthly
+        period: 'D' for daily, 'W' for weekly, 'M' for monthly, or a list of
+            these to compute several breakdowns from one prepared frame
         time_range: 'all', 'ytd', 'mtd', '30d', '7d', 'custom'
         
     Returns:
-        DataFrame with period winrates
+        DataFrame with period winrates, or a dict of them keyed by period
+        when a list of periods is given (empty if there are no closed trades)
     """
+    periods = [period] if isinstance(period, str) else list(period)
+    
+    def result(breakdowns):
+        if isinstance(period, str):
+            return breakdowns.get(period, pd.DataFrame())
+        return breakdowns
+    
     if df is None or df.empty:
-        return pd.DataFrame()
+        return result({})
     
     try:
         # Step 1: Ensure datetime column exists and is properly formatted
         date_col = 'created_at'
         if date_col not in df.columns:
-            return pd.DataFrame()
-        
-        # Step 2: Clean and standardize datetime column
-        df_clean = df.copy()
-        df_clean = standardize_datetime_column(df_clean, date_col)
+            return result({})
         
-        # Step 3: Filter only closed trades (has outcome)
-        closed_df = df_clean[
-            df_clean['final_outcome'].notna() & 
-            (df_clean['final_outcome'] != 'open') &
-            (df_clean['final_outcome'] != '')
-        ].copy()
+        # Steps 2-3: Closed trades with clean dates and win flags (shared view)
+        closed_df = get_closed_view(df)
         
         if closed_df.empty:
-            return pd.DataFrame()
+            return result({})
         
         # Step 4: Apply time range filtering BEFORE calculating winrates
         filtered_df = apply_time_range_filter(closed_df, time_range, date_col)
         
         if filtered_df.empty:
-            return pd.DataFrame()
-        
-        # Step 5: Add win/loss flags
-        filtered_df['is_winner'] = filtered_df['final_outcome'].str.startswith('tp', na=False)
-        
-        # Step 6: Calculate based on period
-        if period == 'D':
-            return calculate_daily_breakdown(filtered_df)
-        elif period == 'W':
-            return calculate_weekly_breakdown(filtered_df)
-        elif period == 'M':
-            return calculate_monthly_breakdown(filtered_df)
-        else:
-            return calculate_daily_breakdown(filtered_df)
+            return result({})
+        
+        # Step 5: Calculate each period from the same filtered frame
+        # (unknown periods fall back to daily)
+        return result({
+            p: calculate_period_breakdown(filtered_df, p if p in ('W', 'M') else 'D')
+            for p in periods
+        })
             
     except Exception as e:
         st.error(f"Winrate calculation error: {e}")
-        return pd.DataFrame()
+        return result({})
+
+def standardize_datetime_values(values):
+    """
+    Parse a datetime Series as naive UTC; unparseable values become NaT
+    
+    Columns that are already datetime64 skip parsing (aware ones are only
+    converted to UTC). Strings go through parse_datetime_column, which
+    detects the layout once so pandas can use its fixed-format parser.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        if isinstance(values.dtype, pd.DatetimeTZDtype):
+            return values.dt.tz_convert('UTC').dt.tz_localize(None)
+        return values
+    
+    return parse_datetime_column(values, utc=True).dt.tz_localize(None)
 
 def standardize_datetime_column(df, date_col):
     """
     Properly standardize datetime column to prevent comparison errors
     """
     try:
-        # Convert to datetime with error handling
-        df[date_col] = pd.to_datetime(df[date_col], errors='coerce', utc=True)
-        
-        # Remove timezone info to prevent comparison issues
-        if df[date_col].dt.tz is not None:
-            df[date_col] = df[date_col].dt.tz_localize(None)
+        # Convert to naive UTC datetimes with error handling
+        df[date_col] = standardize_datetime_values(df[date_col])
         
         # Remove any NaT values
         df = df[df[date_col].notna()]
@@ -85,103 +148,139 @@ def standardize_datetime_column(df, date_col):
         st.warning(f"Datetime standardization warning: {e}")
         return df
 
-def apply_time_range_filter(df, time_range, date_col):
+def current_time_bucket():
+    """Current time floored to NOW_BUCKET_SECONDS, so cutoffs stay stable across reruns"""
+    return pd.Timestamp.now().floor(f'{NOW_BUCKET_SECONDS}s')
+
+def apply_time_range_filter(df, time_range, date_col, now=None):
     """
     Apply time range filter to dataframe with proper datetime handling
+    
+    Date-sorted datetime columns (such as the closed-trade view) are sliced
+    at the cutoff found by binary search instead of building a boolean mask.
+    `now` defaults to the current 10-minute bucket; pass a fixed time to
+    pin the cutoffs.
     """
     if time_range == 'all':
         return df
     
     try:
-        now = pd.Timestamp.now()
+        now = current_time_bucket() if now is None else pd.Timestamp(now)
         
         if time_range == 'ytd':
             start_date = pd.Timestamp(now.year, 1, 1)
-            return df[df[date_col] >= start_date]
-            
         elif time_range == 'mtd':
             start_date = pd.Timestamp(now.year, now.month, 1)
-            return df[df[date_col] >= start_date]
-            
         elif time_range == '30d':
             start_date = now - pd.Timedelta(days=30)
-            return df[df[date_col] >= start_date]
-            
         elif time_range == '7d':
             start_date = now - pd.Timedelta(days=7)
-            return df[df[date_col] >= start_date]
+        else:
+            return df
         
-        return df
+        dates = df[date_col]
+        if pd.api.types.is_datetime64_any_dtype(dates) and dates.is_monotonic_increasing:
+            return df.iloc[dates.searchsorted(start_date):]
+        
+        return df[dates >= start_date]
         
     except Exception as e:
         st.warning(f"Time filter error: {e}")
         return df
 
-def calculate_daily_breakdown(df):
-    """Calculate daily winrate breakdown with proper error handling"""
+def period_start_dates(timestamps, period):
+    """
+    Start of the day, week (Monday) or month containing each datetime64 value
+    
+    Computed with numpy unit casts and integer day arithmetic rather than
+    building a PeriodArray and asking it for start times. Day 0 of the epoch
+    was a Thursday, hence the +3 when counting days since Monday.
+    """
+    if period == 'M':
+        starts = timestamps.astype('datetime64[M]')
+    else:
+        starts = timestamps.astype('datetime64[D]')
+        if period == 'W':
+            starts = starts - (starts.view(np.int64) + 3) % 7
+    
+    return starts.astype(timestamps.dtype)
+
+def count_period_winrates(keys, is_winner, key_name):
+    """
+    Trades, wins and winrate per distinct datetime64 period key, in key order
+    
+    The closed-trade view is date-sorted, so each period is a contiguous run:
+    run starts come from one np.diff over the integer keys and wins are summed
+    per run with np.add.reduceat. Unsorted keys are factorized and counted
+    with np.bincount instead.
+    """
+    ordinals = keys.view(np.int64)
+    is_winner = np.asarray(is_winner, dtype=np.int64)
+    
+    if len(ordinals) and (np.diff(ordinals) >= 0).all():
+        starts = np.flatnonzero(np.diff(ordinals, prepend=ordinals[0] - 1))
+        periods = keys[starts]
+        total_trades = np.diff(np.append(starts, len(ordinals)))
+        winning_trades = np.add.reduceat(is_winner, starts)
+    else:
+        codes, periods = pd.factorize(keys, sort=True)
+        total_trades = np.bincount(codes, minlength=len(periods))
+        winning_trades = np.bincount(codes, weights=is_winner, minlength=len(periods)).astype(np.int64)
+    
+    return pd.DataFrame({
+        key_name: periods,
+        'total_trades': total_trades,
+        'winning_trades': winning_trades,
+        'winrate': np.round(winning_trades / total_trades * 100, 2)
+    })
+
+def calculate_period_breakdown(df, period):
+    """
+    Winrate breakdown for 'D', 'W' or 'M' periods
+    
+    Rows are bucketed by their period start date. Weekly and monthly results
+    also carry the matching Period, derived from the bucket starts only.
+    """
     try:
-        # Group by day
-        df['period_date'] = df['created_at'].dt.date
+        period_date = period_start_dates(df['created_at'].to_numpy(), period)
+        period_stats = count_period_winrates(period_date, df['is_winner'], 'period_date')
         
-        daily_stats = df.groupby('period_date').agg({
-            'signal_id': 'count',
-            'is_winner': 'sum'
-        }).reset_index()
-        
-        daily_stats.columns = ['period_date', 'total_trades', 'winning_trades']
-        daily_stats['winrate'] = (daily_stats['winning_trades'] / daily_stats['total_trades'] * 100).round(2)
-        
-        # Convert period_date back to datetime for plotting
-        daily_stats['period_date'] = pd.to_datetime(daily_stats['period_date'])
-        
-        # Ensure we have valid data
-        daily_stats = daily_stats[daily_stats['total_trades'] > 0]
+        if period == 'D':
+            return period_stats
         
-        return daily_stats
+        period_stats['period'] = period_stats['period_date'].dt.to_period(period)
+        return period_stats[['period', 'total_trades', 'winning_trades', 'winrate', 'period_date']]
         
     except Exception as e:
-        st.error(f"Daily breakdown calculation error: {e}")
+        st.error(f"{get_period_label(period)} breakdown calculation error: {e}")
         return pd.DataFrame()
 
+def calculate_daily_breakdown(df):
+    """Calculate daily winrate breakdown"""
+    return calculate_period_breakdown(df, 'D')
+
 def calculate_weekly_breakdown(df):
     """Calculate weekly winrate breakdown"""
-    try:
-        df['period'] = df['created_at'].dt.to_period('W')
-        
-        weekly_stats = df.groupby('period').agg({
-            'signal_id': 'count',
-            'is_winner': 'sum'
-        }).reset_index()
-        
-        weekly_stats.columns = ['period', 'total_trades', 'winning_trades']
-        weekly_stats['winrate'] = (weekly_stats['winning_trades'] / weekly_stats['total_trades'] * 100).round(2)
-        weekly_stats['period_date'] = weekly_stats['period'].dt.start_time
-        
-        return weekly_stats[weekly_stats['total_trades'] > 0]
-        
-    except Exception as e:
-        st.error(f"Weekly breakdown calculation error: {e}")
-        return pd.DataFrame()
+    return calculate_period_breakdown(df, 'W')
 
 def calculate_monthly_breakdown(df):
     """Calculate monthly winrate breakdown"""
-    try:
-        df['period'] = df['created_at'].dt.to_period('M')
-        
-        monthly_stats = df.groupby('period').agg({
-            'signal_id': 'count',
-            'is_winner': 'sum'
-        }).reset_index()
-        
-        monthly_stats.columns = ['period', 'total_trades', 'winning_trades']
-        monthly_stats['winrate'] = (monthly_stats['winning_trades'] / monthly_stats['total_trades'] * 100).round(2)
-        monthly_stats['period_date'] = monthly_stats['period'].dt.start_time
-        
-        return monthly_stats[monthly_stats['total_trades'] > 0]
-        
-    except Exception as e:
-        st.error(f"Monthly breakdown calculation error: {e}")
-        return pd.DataFrame()
+    return calculate_period_breakdown(df, 'M')
+
+def linear_fit(x, y):
+    """
+    Least-squares slope and intercept of a straight line through (x, y)
+    
+    Closed-form equivalent of np.polyfit(x, y, 1) without building a
+    Vandermonde matrix and solving it by SVD.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    x_mean, y_mean = x.mean(), y.mean()
+    x_dev = x - x_mean
+    
+    slope = np.dot(x_dev, y - y_mean) / np.dot(x_dev, x_dev)
+    return slope, y_mean - slope * x_mean
 
 def calculate_winrate_trend(winrate_data):
     """Calculate trend direction and slope with enhanced analysis"""
@@ -202,7 +301,7 @@ def calculate_winrate_trend(winrate_data):
         y_valid = y[valid_mask]
         
         # Calculate slope
-        slope = np.polyfit(x_valid, y_valid, 1)[0]
+        slope, _ = linear_fit(x_valid, y_valid)
         
         # Determine trend with more granular thresholds
         if slope > 2:
@@ -240,36 +339,71 @@ def calculate_rolling_winrate(df, window=30, time_range='all'):
         return pd.DataFrame()
     
     try:
-        # Clean datetime first
-        df_clean = standardize_datetime_column(df.copy(), 'created_at')
-        
-        # Apply time range filter
-        filtered_df = apply_time_range_filter(df_clean, time_range, 'created_at')
-        closed_df = filtered_df[
-            filtered_df['final_outcome'].notna() & 
-            (filtered_df['final_outcome'] != 'open')
-        ].copy()
+        # Closed trades, already date-sorted with win flags, then time range filter
+        closed_df = apply_time_range_filter(get_closed_view(df), time_range, 'created_at')
         
         if closed_df.empty:
             return pd.DataFrame()
         
-        # Sort by date
-        closed_df = closed_df.sort_values('created_at')
-        closed_df['is_winner'] = closed_df['final_outcome'].str.startswith('tp', na=False)
-        
-        # Calculate rolling winrate
-        closed_df['rolling_winrate'] = (
-            closed_df['is_winner']
-            .rolling(window=window, min_periods=1)
-            .mean() * 100
-        )
+        # Rolling winrate from prefix sums: wins in the last `window` trades
+        # (fewer at the start) divided by the number of trades in that span
+        is_winner = closed_df['is_winner'].to_numpy()
+        wins_so_far = np.cumsum(is_winner, dtype=np.int64)
+        window_wins = wins_so_far.copy()
+        window_wins[window:] -= wins_so_far[:-window]
+        window_size = np.minimum(np.arange(1, len(is_winner) + 1), window)
         
-        return closed_df[['created_at', 'rolling_winrate', 'is_winner']].copy()
+        return pd.DataFrame({
+            'created_at': closed_df['created_at'].to_numpy(),
+            'rolling_winrate': window_wins / window_size * 100,
+            'is_winner': is_winner
+        }, index=closed_df.index)
         
     except Exception as e:
         st.error(f"Rolling winrate calculation error: {e}")
         return pd.DataFrame()
 
+def get_winrate_summary_stats(df, time_range='all'):
+    """
+    Overall winrate and per-outcome counts for closed trades
+    
+    Categorical outcomes are counted with a single np.bincount over their
+    codes rather than a value_counts plus a lookup per outcome.
+    """
+    if df is None or df.empty or 'created_at' not in df.columns or 'final_outcome' not in df.columns:
+        return {'error': 'No data available for winrate statistics'}
+    
+    try:
+        closed_df = apply_time_range_filter(get_closed_view(df), time_range, 'created_at')
+        
+        if closed_df.empty:
+            return {'error': 'No closed trades found'}
+        
+        outcome = closed_df['final_outcome']
+        if isinstance(outcome.dtype, pd.CategoricalDtype):
+            codes = outcome.cat.codes.to_numpy()
+            counts = np.bincount(codes[codes >= 0], minlength=len(outcome.cat.categories))
+            outcome_counts = dict(zip(outcome.cat.categories, counts))
+        else:
+            outcome_counts = outcome.value_counts().to_dict()
+        
+        total_trades = len(closed_df)
+        winning_trades = int(closed_df['is_winner'].sum())
+        
+        stats = {
+            'total_trades': total_trades,
+            'winning_trades': winning_trades,
+            'losing_trades': total_trades - winning_trades,
+            'overall_winrate': winning_trades / total_trades * 100
+        }
+        for outcome_name in ['tp1', 'tp2', 'tp3', 'tp4', 'sl']:
+            stats[f'{outcome_name}_count'] = int(outcome_counts.get(outcome_name, 0))
+        
+        return stats
+        
+    except Exception as e:
+        return {'error': f"Winrate statistics error: {e}"}
+
 def get_time_range_label(time_range):
     """Get human readable label for time range"""
     labels = {
@@ -216,7 +216,7 @@ def format_dataframe_for_display(df):
     
     # Format outcome column using NEW column name
     if 'Result' in display_df.columns:
-        display_df['Result'] = display_df['Result'].fillna('None')
+        display_df['Result'] = display_df['Result'].astype(object).fillna('None')
     
     # Format tp_level using NEW column name
     if 'TP Level' in display_df.columns:
@@ -26,7 +26,7 @@ st.set_page_config(
 try:
     from database.connection import get_connection_status, load_data
     from data_processing.signal_processor import process_signals
-    from utils.helpers import apply_filters, format_number
+    from utils.helpers import apply_filters, format_number, is_tp_outcome
     from config.theme import COLORS, CUSTOM_CSS
     st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 except ImportError as e:
@@ -294,7 +294,7 @@ def render_performance_timeline(data, coin):
     
     # Create daily aggregation
     closed_data['date'] = closed_data['created_at'].dt.date
-    closed_data['is_winner'] = closed_data['final_outcome'].str.startswith('tp', na=False)
+    closed_data['is_winner'] = is_tp_outcome(closed_data['final_outcome'])
     
     daily_stats = closed_data.groupby('date').agg({
         'is_winner': ['sum', 'count']
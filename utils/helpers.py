@@ -6,6 +6,15 @@ import numpy as np
 import streamlit as st
 from datetime import datetime, timedelta
 
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Arrow-backed strings keep text in one contiguous buffer and run .str ops in C
+STRING_DTYPE = 'string[pyarrow]' if PYARROW_AVAILABLE else str
+
 def normalize_column_names(df, mappings=None):
     """
     Normalize column names based on mappings
@@ -43,6 +52,49 @@ def safe_col(df, candidates, default=None):
     
     return default
 
+# Timestamp layouts seen from the signal sources, most common first
+DATETIME_FORMATS = [
+    '%Y-%m-%dT%H:%M:%S%z',
+    '%Y-%m-%d %H:%M:%S%z',
+    '%Y-%m-%dT%H:%M:%S.%f%z',
+    '%Y-%m-%d %H:%M:%S.%f%z',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d %H:%M:%S.%f',
+    '%Y-%m-%d'
+]
+
+def detect_datetime_format(values):
+    """Return the first DATETIME_FORMATS entry that parses the first non-null string, else None"""
+    sample = values.dropna().head(1)
+    if sample.empty or not isinstance(sample.iloc[0], str):
+        return None
+    
+    sample = sample.iloc[0].strip()
+    for fmt in DATETIME_FORMATS:
+        try:
+            datetime.strptime(sample, fmt)
+            return fmt
+        except ValueError:
+            continue
+    return None
+
+def parse_datetime_column(values, **kwargs):
+    """
+    pd.to_datetime(errors='coerce') with the format detected once up front
+    
+    An explicit format takes pandas' vectorized parser instead of sniffing
+    each element; if any value does not fit it, the whole column is parsed
+    the general way so mixed layouts still convert.
+    """
+    fmt = detect_datetime_format(values)
+    if fmt:
+        parsed = pd.to_datetime(values, format=fmt, errors='coerce', **kwargs)
+        if not (parsed.isna() & values.notna()).any():
+            return parsed
+    
+    return pd.to_datetime(values, errors='coerce', **kwargs)
+
 def ensure_datetime(df, col):
     """Enhanced datetime conversion with error handling"""
     if df is None or col not in df.columns:
@@ -50,10 +102,10 @@ def ensure_datetime(df, col):
     
     try:
         # Try direct conversion first
-        df[col] = pd.to_datetime(df[col], errors='coerce')
+        df[col] = parse_datetime_column(df[col])
         
         # Remove timezone info if present
-        if hasattr(df[col].dtype, 'tz') and df[col].dtype.tz is not None:
+        if isinstance(df[col].dtype, pd.DatetimeTZDtype):
             df[col] = df[col].dt.tz_localize(None)
         
         return df
@@ -62,6 +114,71 @@ def ensure_datetime(df, col):
         st.warning(f"⚠️ Datetime conversion failed for {col}: {e}")
         return df
 
+def tp_label_mask(labels):
+    """
+    Boolean numpy mask of take-profit labels (tp1..tp4) in an Index or Series
+    
+    Labels that are not strings (e.g. the float categories of an all-NaN
+    column cast to category) are compared by their string form.
+    """
+    if not pd.api.types.is_string_dtype(labels):
+        labels = labels.astype(str)
+    return np.asarray(labels.str.startswith('tp', na=False), dtype=bool)
+
+def is_tp_outcome(outcome):
+    """
+    Boolean Series marking take-profit outcomes (tp1..tp4)
+    
+    Categorical outcomes are resolved once per category and gathered by code;
+    the extra trailing False is what missing values (code -1) pick up.
+    """
+    if isinstance(outcome.dtype, pd.CategoricalDtype):
+        is_tp_by_code = np.append(tp_label_mask(outcome.cat.categories), False)
+        return pd.Series(is_tp_by_code[outcome.cat.codes.to_numpy()], index=outcome.index)
+    return pd.Series(tp_label_mask(outcome), index=outcome.index)
+
+def add_outcome_flags(df):
+    """
+    Attach boolean outcome flags so render functions can share them
+    
+    Adds _is_tp, _is_sl and _is_closed derived from final_outcome. Frames
+    that already carry the flags are returned unchanged.
+    """
+    if df is None or 'final_outcome' not in df.columns or '_is_tp' in df.columns:
+        return df
+    
+    outcome = df['final_outcome']
+    return df.assign(
+        _is_tp=is_tp_outcome(outcome),
+        _is_sl=outcome.eq('sl'),
+        _is_closed=outcome.notna() & outcome.ne('open') & outcome.ne('')
+    )
+
+# Common string spellings of a missing value
+NULL_STRINGS = ['nan', 'NaN', 'None', 'null', 'NULL', '']
+
+def clean_pair_labels(pair):
+    """
+    Uppercase/strip trading pairs and map null spellings to UNKNOWN, as a categorical
+    
+    Pairs repeat heavily, so the string work runs once per distinct value and
+    rows are re-encoded through integer codes.
+    """
+    codes, uniques = pd.factorize(pair)
+    labels = pd.Index(uniques).astype(str).astype(STRING_DTYPE)
+    cleaned = np.where(labels.isin(NULL_STRINGS), 'UNKNOWN', labels.str.upper().str.strip())
+    
+    # Missing values (code -1) read the trailing UNKNOWN; cleaning can merge
+    # labels, so categories are rebuilt from the cleaned values
+    if (codes == -1).any():
+        cleaned = np.append(cleaned, 'UNKNOWN')
+    categories, code_map = np.unique(cleaned.astype(str), return_inverse=True)
+    return pd.Series(
+        pd.Categorical.from_codes(code_map.reshape(-1)[codes], categories=categories),
+        index=pair.index,
+        name=pair.name
+    )
+
 def clean_data(df):
     """Enhanced data cleaning with better error handling"""
     if df is None or df.empty:
@@ -77,34 +194,35 @@ def clean_data(df):
             st.info(f"🗑️ Removed {initial_rows - len(df_clean)} completely empty rows")
         
         # Clean essential string columns
-        string_cols = ['pair', 'signal_id', 'final_outcome']
+        string_cols = ['signal_id', 'final_outcome']
         for col in string_cols:
             if col in df_clean.columns:
                 # Convert to string and clean
                 df_clean[col] = df_clean[col].astype(str)
                 
                 # Replace common null representations
-                null_values = ['nan', 'NaN', 'None', 'null', 'NULL', '']
-                df_clean[col] = df_clean[col].replace(null_values, None)
-                
-                # Special handling for pair column
-                if col == 'pair':
-                    df_clean[col] = df_clean[col].fillna('UNKNOWN')
-                    df_clean[col] = df_clean[col].str.upper().str.strip()
+                df_clean[col] = df_clean[col].replace(NULL_STRINGS, None)
+        
+        # Special handling for pair column
+        if 'pair' in df_clean.columns:
+            df_clean['pair'] = clean_pair_labels(df_clean['pair'])
         
         # Clean numeric columns
         numeric_cols = ['entry', 'target1', 'target2', 'target3', 'target4', 'stop1', 'stop2', 'rr_planned']
-        for col in numeric_cols:
-            if col in df_clean.columns:
-                # Convert to numeric
-                df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce')
-                
-                # Remove unrealistic values
-                if col in ['entry', 'target1', 'target2', 'target3', 'target4', 'stop1', 'stop2']:
-                    # Remove negative or zero prices
-                    df_clean.loc[df_clean[col] <= 0, col] = np.nan
-                    # Remove extremely high prices (likely errors)
-                    df_clean.loc[df_clean[col] > 1000000, col] = np.nan
+        price_cols = ['entry', 'target1', 'target2', 'target3', 'target4', 'stop1', 'stop2']
+        present_numeric = [col for col in numeric_cols if col in df_clean.columns]
+        present_prices = [col for col in price_cols if col in df_clean.columns]
+        
+        if present_numeric:
+            # Convert to numeric
+            df_clean[present_numeric] = df_clean[present_numeric].apply(pd.to_numeric, errors='coerce')
+        
+        if present_prices:
+            # Remove negative/zero and extremely high prices (likely errors)
+            # with one mask over the whole price block
+            prices = df_clean[present_prices].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+            np.putmask(prices, (prices <= 0) | (prices > 1000000), np.nan)
+            df_clean[present_prices] = prices
         
         return df_clean
         
@@ -184,7 +302,7 @@ def apply_time_range_filter(df, time_range):
             df['created_at'] = pd.to_datetime(df['created_at'], errors='coerce')
         
         # Remove timezone if present to prevent comparison errors
-        if hasattr(df['created_at'].dtype, 'tz') and df['created_at'].dtype.tz is not None:
+        if isinstance(df['created_at'].dtype, pd.DatetimeTZDtype):
             df['created_at'] = df['created_at'].dt.tz_localize(None)
         
         # Calculate cutoff dates
@@ -268,7 +386,7 @@ def calculate_basic_stats(df):
         stats['completion_rate'] = (closed_trades / len(df) * 100) if len(df) > 0 else 0
         
         if closed_trades > 0:
-            tp_hits = df['final_outcome'].str.startswith('tp', na=False).sum()
+            tp_hits = is_tp_outcome(df['final_outcome']).sum()
             stats['win_rate'] = (tp_hits / closed_trades * 100)
         else:
             stats['win_rate'] = 0
@@ -370,7 +488,7 @@ def debug_data_issues(data):
     if 'created_at' in data.columns:
         debug_info["datetime_info"] = {
             "dtype": str(data['created_at'].dtype),
-            "has_timezone": hasattr(data['created_at'].dtype, 'tz') and data['created_at'].dtype.tz is not None,
+            "has_timezone": isinstance(data['created_at'].dtype, pd.DatetimeTZDtype),
             "null_count": data['created_at'].isnull().sum(),
             "unique_count": data['created_at'].nunique()
         }